@@ -7,10 +7,20 @@ import pandas as pd
 from typing import Optional, Tuple
 
 # Import modules
-from performance import get_past_system_metrics, predict_future_trends, load_user_data_from_csv
+from performance import get_past_system_metrics, predict_future_trends, sample_system_metrics
 from bottlenecks import get_real_time_metrics, detect_bottlenecks
 from optimizations import suggest_optimizations
+from csv_follow import CSVFollower
 from generate_test_data import generate_random_usage_data, save_to_csv
+from timeseries import last, with_time_labels, timestamps_of
+from processes import scan_processes
+from root_cause import ProcessSeriesCollector, rank_root_causes
+from threads import ThreadSampler, summarize_threads, TOP_THREADS
+from exhaustion import ExhaustionTracker
+from leaks import LeakDetector
+from cpu_cores import CoreHistory, read_core_times
+
+PAST_ROWS_SHOWN = 100  # longer histories are summarized, then only their newest rows are listed
 
 class ConsoleOutput:
     """Class to capture console output and display in GUI"""
@@ -39,9 +49,22 @@ class SystemMonitorApp:
         self.test_csv_path = "test_data.csv"
         self.default_period = 1  # hours
         self.default_interval = 6  # minutes
+        self.default_window = 0  # hours of history to analyze, 0 = all
+        self.thread_refresh_ms = 250
+        self.last_culprit_pid = None
+        self.process_sample_ms = 10000  # one process scan per tick feeds the three trackers below
+        self.exhaustion_tracker = ExhaustionTracker()
+        self.leak_detector = LeakDetector()
+        self.process_collector = ProcessSeriesCollector()
+        self.core_sample_ms = 10000
+        self.core_times = read_core_times()
+        self.core_history = CoreHistory(self.core_times[0], capacity=30)  # 5 min of per-core samples
+        self.csv_follower = CSVFollower(self.test_csv_path)
         
         self.setup_ui()
         self.ensure_test_data_exists()
+        self.track_processes()
+        self.track_cores()
         
         self.dark_mode = False
         self.setup_theme()
@@ -68,6 +91,7 @@ class SystemMonitorApp:
             ("📊 Performance", self.show_performance_input),
             ("⚠️ Bottlenecks", self.display_bottlenecks),
             ("🔧 Optimizations", self.display_optimizations),
+            ("🧵 Threads", self.show_thread_drilldown),
             ("🧹 Clear", self.clear_output),
             ("🌙 Toggle Theme", self.toggle_theme)
         ]
@@ -135,7 +159,7 @@ class SystemMonitorApp:
         input_window.title("Performance Analysis Settings")
         input_window.transient(self.root)
         input_window.grab_set()
-        self.center_window(input_window, 350, 200)
+        self.center_window(input_window, 350, 240)
         
         ttk.Label(input_window, text="Data Source:").grid(row=0, column=0, padx=5, pady=5, sticky="e")
         self.data_source_var = tk.StringVar(value="real-time")
@@ -154,8 +178,13 @@ class SystemMonitorApp:
         self.interval_entry.insert(0, str(self.default_interval))
         self.interval_entry.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
         
+        ttk.Label(input_window, text="History Window (hours, 0 = all):").grid(row=3, column=0, padx=5, pady=5, sticky="e")
+        self.window_entry = ttk.Entry(input_window)
+        self.window_entry.insert(0, str(self.default_window))
+        self.window_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+        
         button_frame = ttk.Frame(input_window)
-        button_frame.grid(row=3, column=0, columnspan=2, pady=(10, 0))
+        button_frame.grid(row=4, column=0, columnspan=2, pady=(10, 0))
         ttk.Button(button_frame, text="Run Analysis", command=self.run_performance_analysis).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Cancel", command=input_window.destroy).pack(side=tk.LEFT, padx=5)
         
@@ -165,9 +194,10 @@ class SystemMonitorApp:
         try:
             total_period = float(self.total_period_entry.get())
             interval = int(self.interval_entry.get())
+            window = float(self.window_entry.get())
             data_source = self.data_source_var.get()
             
-            if total_period <= 0 or interval <= 0:
+            if total_period <= 0 or interval <= 0 or window < 0:
                 raise ValueError("Values must be positive numbers")
             
             self.clear_output()
@@ -175,15 +205,24 @@ class SystemMonitorApp:
             self.root.update()
             time.sleep(0.1)
             
+            future_data = None
             if data_source == "real-time":
                 past_data, time_unit = get_past_system_metrics()
                 source_info = "Real-time system data"
             else:
-                past_data = load_user_data_from_csv(self.test_csv_path)
+                # Only rows appended since the last analysis are parsed
+                new_rows = self.csv_follower.poll()
+                past_data = self.csv_follower.history()
                 time_unit = "User-defined intervals"
-                source_info = f"CSV data from {self.test_csv_path}"
+                source_info = f"CSV data from {self.test_csv_path} (+{new_rows} new rows)"
+                if window == 0:
+                    future_data = self.csv_follower.forecast(total_period, interval)
+            
+            if window > 0:
+                past_data = last(past_data, window * 3600)
             
-            future_data = predict_future_trends(past_data, total_period, interval)
+            if future_data is None:
+                future_data = predict_future_trends(past_data, total_period, interval)
             self.display_performance_results(past_data, future_data, source_info)
             self.status_var.set("Performance analysis completed")
             
@@ -198,9 +237,19 @@ class SystemMonitorApp:
         self.output_text.insert(tk.END, "=== SYSTEM PERFORMANCE ANALYSIS ===\n", 'header')
         self.output_text.insert(tk.END, f"Data Source: {source_info}\n\n")
         self.output_text.insert(tk.END, "=== PAST METRICS ===\n", 'header')
-        self.output_text.insert(tk.END, past_data.to_string() + "\n\n")
+        if len(past_data) > PAST_ROWS_SHOWN:
+            # A followed CSV can hold hundreds of thousands of rows; rendering them all stalls the GUI
+            self.output_text.insert(tk.END, f"{len(past_data)} samples, showing the newest {PAST_ROWS_SHOWN}\n")
+            self.output_text.insert(tk.END, past_data.describe().loc[["mean", "min", "max"]].round(2).to_string() + "\n\n")
+            shown = with_time_labels(past_data.iloc[-PAST_ROWS_SHOWN:], timestamps_of(past_data)[0])
+            shown.index += len(past_data) - PAST_ROWS_SHOWN
+        else:
+            shown = with_time_labels(past_data)
+        self.output_text.insert(tk.END, shown.to_string() + "\n\n")
         self.output_text.insert(tk.END, "=== FUTURE PREDICTIONS ===\n", 'header')
-        self.output_text.insert(tk.END, future_data.to_string() + "\n")
+        # Future offsets are shown relative to the newest past sample
+        origin = timestamps_of(past_data)[-1]
+        self.output_text.insert(tk.END, with_time_labels(future_data, origin).to_string() + "\n")
         self.output_text.see(tk.END)
     
     def display_bottlenecks(self):
@@ -210,12 +259,23 @@ class SystemMonitorApp:
             self.root.update()
             time.sleep(0.1)
             
-            metrics = get_real_time_metrics()
-            bottlenecks = detect_bottlenecks()
+            sample, disk_rates, net_rates, cores = sample_system_metrics(interval=1)
+            metrics = get_real_time_metrics(sample)
+            culprits = rank_root_causes(*self.process_collector.series())
+            if not culprits.empty:
+                self.last_culprit_pid = int(culprits["PID"].iloc[0])
+            bottlenecks = detect_bottlenecks(sample, disk_rates, net_rates, cores, culprits, self.leak_detector.leaks(),
+                                             self.core_history)
             
             self.output_text.insert(tk.END, "=== SYSTEM BOTTLENECKS ===\n", 'header')
             self.output_text.insert(tk.END, "Current Metrics:\n")
             self.output_text.insert(tk.END, metrics.to_string(index=False) + "\n\n")
+            if not disk_rates.empty:
+                self.output_text.insert(tk.END, "Disk I/O:\n")
+                self.output_text.insert(tk.END, disk_rates.to_string(index=False) + "\n\n")
+            if not net_rates.empty:
+                self.output_text.insert(tk.END, "Network I/O:\n")
+                self.output_text.insert(tk.END, net_rates.to_string(index=False) + "\n\n")
             self.output_text.insert(tk.END, "Bottleneck Analysis:\n")
             
             for line in bottlenecks:
@@ -240,7 +300,7 @@ class SystemMonitorApp:
             self.root.update()
             time.sleep(0.1)
 
-            suggestions = suggest_optimizations()
+            suggestions = suggest_optimizations(etas=self.exhaustion_tracker.estimate())
 
             self.output_text.insert(tk.END, "=== OPTIMIZATION SUGGESTIONS ===\n", 'header')
             for line in suggestions:
@@ -258,6 +318,99 @@ class SystemMonitorApp:
             messagebox.showerror("Error", f"Failed to generate suggestions: {str(e)}")
             self.status_var.set("Optimization suggestion failed")
     
+    def track_processes(self):
+        # One walk of the process table per tick feeds the time-to-exhaustion fits, the leak
+        # detector's trend state and the rolling window ranked when the bottleneck report opens
+        try:
+            processes = scan_processes()
+        except Exception as e:
+            print(f"Process scan failed: {e}")
+            processes = None
+        if processes is not None:
+            for name, sample in (("Resource snapshot", self.exhaustion_tracker.sample),
+                                 ("Leak sample", self.leak_detector.sample),
+                                 ("Process sample", self.process_collector.sample)):
+                try:
+                    sample(processes=processes)
+                except Exception as e:
+                    print(f"{name} failed: {e}")
+        self.root.after(self.process_sample_ms, self.track_processes)
+    
+    def track_cores(self):
+        # Per-core detectors in the bottleneck report run over this cores x time window
+        try:
+            core_times = read_core_times()
+            self.core_history.sample(self.core_times, core_times)
+            self.core_times = core_times
+        except Exception as e:
+            print(f"Core sample failed: {e}")
+        self.root.after(self.core_sample_ms, self.track_cores)
+    
+    def show_thread_drilldown(self):
+        window = tk.Toplevel(self.root)
+        window.title("Thread Drill-Down")
+        window.transient(self.root)
+        self.center_window(window, 600, 420)
+        
+        ttk.Label(window, text="PID(s):").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        pid_entry = ttk.Entry(window)
+        if self.last_culprit_pid is not None:
+            pid_entry.insert(0, str(self.last_culprit_pid))
+        pid_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        
+        columns = ("PID", "TID", "Thread", "State", "CPU (%)")
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=15)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=160 if col == "Thread" else 80, anchor=tk.W if col == "Thread" else tk.E)
+        tree.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="nsew")
+        
+        summary_var = tk.StringVar(value="Enter one or more PIDs separated by commas")
+        ttk.Label(window, textvariable=summary_var).grid(row=2, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        
+        state = {"sampler": None, "job": None}
+        
+        def refresh():
+            threads = state["sampler"].sample()
+            top = threads.nlargest(TOP_THREADS, "CPU (%)")
+            tree.delete(*tree.get_children())
+            for row in top.itertuples(index=False):
+                tree.insert("", tk.END, values=tuple(row))
+            summary = summarize_threads(threads)
+            summary_var.set(", ".join(f"{key}: {value}" for key, value in summary.items()))
+            state["job"] = window.after(self.thread_refresh_ms, refresh)
+        
+        def stop():
+            if state["job"] is not None:
+                window.after_cancel(state["job"])
+                state["job"] = None
+            if state["sampler"] is not None:
+                state["sampler"].close()
+                state["sampler"] = None
+        
+        def start():
+            try:
+                pids = [int(pid) for pid in pid_entry.get().replace(" ", "").split(",") if pid]
+                if not pids:
+                    raise ValueError("Enter at least one PID")
+            except ValueError as e:
+                messagebox.showerror("Input Error", f"Invalid PID: {str(e)}", parent=window)
+                return
+            stop()
+            state["sampler"] = ThreadSampler(pids)
+            state["sampler"].sample()
+            state["job"] = window.after(self.thread_refresh_ms, refresh)
+            self.status_var.set(f"Sampling threads of PID(s) {', '.join(map(str, pids))}")
+        
+        def on_close():
+            stop()
+            window.destroy()
+        
+        ttk.Button(window, text="Start", command=start).grid(row=0, column=2, padx=5, pady=5)
+        window.protocol("WM_DELETE_WINDOW", on_close)
+        window.columnconfigure(1, weight=1)
+        window.rowconfigure(1, weight=1)
+    
     def clear_output(self):
         self.output_text.delete(1.0, tk.END)
         self.status_var.set("Output cleared")
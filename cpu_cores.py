@@ -0,0 +1,163 @@
+import os
+import numpy as np
+import psutil
+
+# /proc/stat per-core fields (guest time is already folded into user/nice)
+CORE_FIELDS = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal")
+# Metrics kept in the cores x time history matrix
+CORE_METRICS = ("busy", "iowait", "irq", "softirq", "steal")
+PROC_STAT = "/proc/stat"
+MIN_CORE_SECONDS = 0.05  # a core needs this much accounted time between snapshots for its shares to mean anything
+
+# Thresholds
+HOT_CORE_PCT = 90
+IMBALANCE_SPREAD_PCT = 40
+SOFTIRQ_STORM_PCT = 20
+STEAL_HIGH_PCT = 10
+MAX_LISTED_CORES = 8
+
+def read_core_times():
+    """Return (core ids, cores x CORE_FIELDS cumulative seconds) from /proc/stat or psutil."""
+    if os.path.exists(PROC_STAT):
+        with open(PROC_STAT) as f:
+            lines = [line.split() for line in f if line.startswith("cpu") and line[3].isdigit()]
+        ids = np.array([int(parts[0][3:]) for parts in lines])
+        times = np.array([parts[1:len(CORE_FIELDS) + 1] for parts in lines], dtype=np.float64)
+        return ids, times / os.sysconf("SC_CLK_TCK")
+    per_cpu = psutil.cpu_times(percpu=True)
+    times = np.array([[getattr(c, field, 0.0) for field in CORE_FIELDS] for c in per_cpu], dtype=np.float64)
+    return np.arange(len(per_cpu)), times
+
+def core_percentages(prev, curr):
+    """Compute per-core time shares (%) between two read_core_times snapshots.
+
+    Cores that went offline or came online between snapshots are dropped.
+    A core with less than MIN_CORE_SECONDS of accounted time (snapshots too
+    close together, where one scheduler tick would read as 0% or 100%) gets
+    a NaN row: its load is unknown, not idle or busy.
+    """
+    prev_ids, prev_times = prev
+    curr_ids, curr_times = curr
+    ids, prev_idx, curr_idx = np.intersect1d(prev_ids, curr_ids, return_indices=True)
+    delta = np.clip(curr_times[curr_idx] - prev_times[prev_idx], 0, None)
+    total = delta.sum(axis=1, keepdims=True)
+    total = np.where(total >= MIN_CORE_SECONDS, total, np.nan)
+    return ids, (delta / total * 100).astype(np.float32)
+
+def core_metrics(percentages):
+    """Reduce cores x CORE_FIELDS percentages to cores x CORE_METRICS (NaN rows stay NaN)."""
+    f = {name: i for i, name in enumerate(CORE_FIELDS)}
+    busy = 100 - percentages[:, f["idle"]] - percentages[:, f["iowait"]]
+    return np.stack([busy] + [percentages[:, f[name]] for name in CORE_METRICS[1:]], axis=1)
+
+def mean_busy(metrics):
+    """System-wide busy % over the cores with a reading; NaN if none has one."""
+    busy = metrics[:, 0] if metrics.size else np.array([])
+    busy = busy[~np.isnan(busy)]
+    return float(busy.mean()) if busy.size else np.nan
+
+def core_means(matrix):
+    """Per-core mean of a cores x time matrix over its non-NaN cells (NaN for a core with none)."""
+    valid = ~np.isnan(matrix)
+    n = valid.sum(axis=1)
+    return np.where(n > 0, np.where(valid, matrix, 0).sum(axis=1) / np.maximum(n, 1), np.nan)
+
+class CoreHistory:
+    """Fixed-capacity ring buffer of per-core metrics stored as a metric x core x time matrix."""
+
+    def __init__(self, ids, capacity=600):
+        self.ids = np.asarray(ids)
+        self.capacity = capacity
+        self.data = np.zeros((len(CORE_METRICS), len(self.ids), capacity), dtype=np.float32)
+        self.count = 0
+
+    def append(self, ids, metrics):
+        """Store one cores x CORE_METRICS sample; a change in the core set (hotplug) restarts the history."""
+        if not np.array_equal(ids, self.ids):
+            self.__init__(ids, self.capacity)
+        self.data[:, :, self.count % self.capacity] = metrics.T
+        self.count += 1
+
+    def sample(self, prev, curr):
+        """Append the per-core metrics between two read_core_times snapshots."""
+        ids, percentages = core_percentages(prev, curr)
+        self.append(ids, core_metrics(percentages))
+
+    def matrix(self, metric, last=None):
+        """Return the cores x time matrix of one metric in chronological order."""
+        filled = min(self.count, self.capacity)
+        last = filled if last is None else min(last, filled)
+        end = self.count % self.capacity
+        idx = np.arange(end - last, end) % self.capacity
+        return self.data[CORE_METRICS.index(metric)][:, idx]
+
+def _core_list(ids, mask):
+    """Format the cores selected by mask, truncating long lists."""
+    cores = [str(i) for i in ids[mask]]
+    if len(cores) > MAX_LISTED_CORES:
+        cores = cores[:MAX_LISTED_CORES] + [f"+{len(cores) - MAX_LISTED_CORES} more"]
+    return ", ".join(cores)
+
+def detect_hot_cores(ids, busy):
+    """Flag cores whose mean busy time over the window exceeds HOT_CORE_PCT."""
+    core_mean = core_means(busy)
+    hot = core_mean > HOT_CORE_PCT
+    if not hot.any():
+        return []
+    return [f"⚠️ High CPU on core(s) {_core_list(ids, hot)}: up to {core_mean.max():.1f}% busy "
+            f"while the average core is at {core_mean.mean():.1f}%"]
+
+def detect_core_imbalance(ids, busy):
+    """Flag uneven load where the busiest core runs far ahead of the average."""
+    if busy.shape[0] < 2:
+        return []
+    core_mean = core_means(busy)
+    spread = core_mean.max() - core_mean.mean()
+    if spread <= IMBALANCE_SPREAD_PCT:
+        return []
+    return [f"Moderate CPU imbalance: core {ids[core_mean.argmax()]} at {core_mean.max():.1f}% "
+            f"vs {core_mean.mean():.1f}% average (spread {spread:.1f} pts). "
+            "Work may be pinned to a single thread or IRQ."]
+
+def detect_softirq_storms(ids, softirq, irq):
+    """Flag cores spending a large share of time servicing interrupts."""
+    interrupt = core_means(softirq + irq)
+    storm = interrupt > SOFTIRQ_STORM_PCT
+    if not storm.any():
+        return []
+    return [f"⚠️ High interrupt load (softirq storm) on core(s) {_core_list(ids, storm)}: "
+            f"up to {interrupt.max():.1f}% in irq/softirq"]
+
+def detect_steal(ids, steal):
+    """Flag hypervisor steal time across all cores."""
+    mean_steal = float(np.nanmean(steal))
+    if mean_steal <= STEAL_HIGH_PCT:
+        return []
+    return [f"⚠️ High CPU steal: {mean_steal:.1f}% of CPU time taken by the hypervisor"]
+
+def _run_core_detectors(ids, busy, irq, softirq, steal):
+    """Apply every per-core detector to cores x time matrices.
+
+    NaN cells (too little core time in that interval) are left out;
+    cores with no reading at all are skipped.
+    """
+    known = ~np.isnan(core_means(busy)) if busy.size else np.zeros(len(ids), dtype=bool)
+    if not known.any():
+        return []
+    ids, busy, irq, softirq, steal = ids[known], busy[known], irq[known], softirq[known], steal[known]
+    results = []
+    results.extend(detect_hot_cores(ids, busy))
+    results.extend(detect_core_imbalance(ids, busy))
+    results.extend(detect_softirq_storms(ids, softirq, irq))
+    results.extend(detect_steal(ids, steal))
+    return results
+
+def detect_core_issues(ids, metrics):
+    """Run the per-core detectors on a single cores x CORE_METRICS sample."""
+    column = {name: metrics[:, i:i + 1] for i, name in enumerate(CORE_METRICS)}
+    return _run_core_detectors(ids, column["busy"], column["irq"], column["softirq"], column["steal"])
+
+def detect_core_history_issues(history, window=None):
+    """Run the per-core detectors over the last `window` samples of a CoreHistory."""
+    busy, irq, softirq, steal = (history.matrix(m, window) for m in ("busy", "irq", "softirq", "steal"))
+    return _run_core_detectors(history.ids, busy, irq, softirq, steal)
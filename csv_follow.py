@@ -0,0 +1,178 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+from performance import project_trends
+from timeseries import TIMESTAMP, make_history, parse_time_labels
+
+VALUE_COLUMNS = ("CPU Usage", "Memory Usage")
+INITIAL_CAPACITY = 1024
+
+class _RunningFit:
+    """Running sums for an ordinary least-squares line, updated in O(new rows)."""
+
+    def __init__(self):
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+
+    def update(self, x, y):
+        self.n += len(x)
+        self.sx += float(x.sum())
+        self.sy += float(y.sum())
+        self.sxx += float((x * x).sum())
+        self.sxy += float((x * y).sum())
+        self.syy += float((y * y).sum())
+
+    def line(self):
+        """Return (slope, intercept); a flat line through the mean for degenerate input."""
+        denom = self.n * self.sxx - self.sx ** 2
+        slope = (self.n * self.sxy - self.sx * self.sy) / denom if self.n > 1 and denom > 0 else 0.0
+        return slope, (self.sy - slope * self.sx) / max(self.n, 1)
+
+    def std(self):
+        """Population standard deviation of y."""
+        if self.n == 0:
+            return 0.0
+        mean = self.sy / self.n
+        return float(np.sqrt(max(self.syy / self.n - mean ** 2, 0.0)))
+
+class CSVFollower:
+    """Tail-follow a growing history CSV, parsing only newly appended lines.
+
+    The follower remembers the byte offset just past the last complete row
+    and the bytes of that row. Each poll() first checks that the file is
+    still the same (same inode, not shorter, last row unchanged). If it is
+    not, the file was rotated or truncated, so the follower starts over.
+    Otherwise it parses only the new complete lines. History columns and
+    the forecast's regression sums are updated from the new rows alone.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.inode = None
+        self.header = None
+        self.last_row = b""
+        self.last_row_offset = 0
+        self.origin = None  # epoch of the first sample; minutes are measured from here
+        self.label_anchor = None  # epoch of offset 0 for legacy "Time (Unit)" files
+        self.size = 0
+        self.columns = {}
+        self.fits = {name: _RunningFit() for name in VALUE_COLUMNS}
+        self.resets = 0
+
+    def _file_changed(self, stat):
+        """Detect rotation (new inode), truncation, or rewrite of the last processed row."""
+        if self.inode is None:
+            return False
+        if (stat.st_dev, stat.st_ino) != self.inode or stat.st_size < self.offset:
+            return True
+        if self.last_row:
+            with open(self.path, "rb") as f:
+                f.seek(self.last_row_offset)
+                return f.read(len(self.last_row)) != self.last_row
+        return False
+
+    def poll(self):
+        """Ingest rows appended since the last poll; returns the number of new rows."""
+        stat = os.stat(self.path)
+        if self._file_changed(stat):
+            resets = self.resets + 1
+            self._reset()
+            self.resets = resets
+        self.inode = (stat.st_dev, stat.st_ino)
+        if stat.st_size == self.offset:
+            return 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        # Leave a trailing partial line for the next poll
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return 0
+        chunk = chunk[:end]
+
+        if self.header is None:
+            # Validate before touching any state, so a bad file fails on every poll
+            header_end = chunk.find(b"\n") + 1
+            header = chunk[:header_end].decode().strip().split(",")
+            missing = [c for c in VALUE_COLUMNS if c not in header]
+            if missing or not (TIMESTAMP in header or "Time (Unit)" in header):
+                raise ValueError("CSV must contain 'Timestamp' (or 'Time (Unit)'), 'CPU Usage', 'Memory Usage' columns")
+            self.header = header
+            chunk = chunk[header_end:]
+        self.offset += end
+        if not chunk.strip():
+            return 0
+
+        last_start = chunk.rfind(b"\n", 0, len(chunk) - 1) + 1
+        self.last_row = chunk[last_start:]
+        self.last_row_offset = self.offset - len(self.last_row)
+
+        rows = pd.read_csv(io.BytesIO(chunk), names=self.header, header=None)
+        self._append(rows, stat)
+        return len(rows)
+
+    def _timestamps(self, rows, stat):
+        if TIMESTAMP in rows.columns:
+            return rows[TIMESTAMP].to_numpy(dtype=float)
+        offsets = parse_time_labels(rows["Time (Unit)"])
+        if self.label_anchor is None:
+            # Same convention as load_user_data_from_csv: the last row of the first read is the mtime
+            self.label_anchor = stat.st_mtime - offsets[-1]
+        return self.label_anchor + offsets
+
+    def _append(self, rows, stat):
+        """Append parsed rows to the column buffers and the running fits."""
+        timestamps = self._timestamps(rows, stat)
+        data = {TIMESTAMP: timestamps}
+        for name in rows.columns:
+            if name not in (TIMESTAMP, "Time (Unit)"):
+                data[name] = rows[name].to_numpy(dtype=float)
+
+        needed = self.size + len(rows)
+        for name, values in data.items():
+            buffer = self.columns.get(name)
+            if buffer is None:
+                buffer = self.columns[name] = np.full(max(INITIAL_CAPACITY, needed), np.nan)
+            elif len(buffer) < needed:
+                grown = np.full(max(len(buffer) * 2, needed), np.nan)
+                grown[:self.size] = buffer[:self.size]
+                buffer = self.columns[name] = grown
+            buffer[self.size:needed] = values
+        self.size = needed
+
+        if self.origin is None:
+            self.origin = timestamps[0]
+        minutes = (timestamps - self.origin) / 60
+        for name, fit in self.fits.items():
+            fit.update(minutes, data[name])
+
+    def history(self):
+        """Return everything ingested so far as a timestamp-indexed history frame."""
+        data = {name: buffer[:self.size] for name, buffer in self.columns.items() if name != TIMESTAMP}
+        return make_history(self.columns.get(TIMESTAMP, np.array([]))[:self.size], data)
+
+    def forecast(self, total_period_hours=1, interval_min=5):
+        """Forecast from the running regression, matching predict_future_trends' output."""
+        if self.size < 2:
+            raise ValueError("Not enough rows to forecast")
+        last_minute = (self.columns[TIMESTAMP][self.size - 1] - self.origin) / 60
+        cpu, mem = self.fits["CPU Usage"], self.fits["Memory Usage"]
+        return project_trends(self.origin, last_minute, cpu.line(), mem.line(), cpu.std(), mem.std(),
+                              total_period_hours, interval_min)
+
+if __name__ == "__main__":
+    import sys
+    import time
+    follower = CSVFollower(sys.argv[1] if len(sys.argv) > 1 else "test_data.csv")
+    while True:
+        new_rows = follower.poll()
+        if new_rows:
+            print(f"+{new_rows} rows ({follower.size} total)")
+            print(follower.forecast().head(3).to_string(), "\n")
+        time.sleep(1)
@@ -0,0 +1,242 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import psutil
+from performance import read_system_counters, metrics_between, get_nic_speeds
+from bottlenecks import detect_bottlenecks
+from optimizations import suggest_optimizations
+from leaks import LeakDetector
+
+# Defaults
+TICK_SECONDS = 1.0
+RECOVERY_SECONDS = 5  # alerts this soon after an event ends are not counted as false positives
+DEFAULT_SCHEDULE = [("cpu", 10, 15), ("memory", 40, 20), ("io", 75, 15)]  # (kind, start s, duration s)
+QUIET_TAIL_SECONDS = 10
+MEMORY_RAMP_MB_PER_S = 50
+MEMORY_CAP_MB = 1024
+IO_CHUNK_MB = 4
+# The shipped leak defaults need 20+ minutes of growth; runs use a compressed window
+LEAK_HALF_LIFE_SECONDS = 30
+LEAK_SUSTAINED_SECONDS = 5
+ALERT_KEYWORDS = {
+    "cpu": ("CPU", "interrupt load"),
+    "memory": ("Memory", "RAM"),
+    # Saturation wording only: "Disk space ..." capacity lines say nothing about I/O load
+    "io": ("Disk I/O", "is saturated", "is moderately busy"),
+}
+
+STRESSORS = {
+    "cpu": "while True:\n    pass\n",
+    "memory": (
+        "import sys, time\n"
+        "rate, cap = int(sys.argv[1]), int(sys.argv[2])\n"
+        "blocks = []\n"
+        "while True:\n"
+        "    if len(blocks) * 8 < cap:\n"
+        "        blocks.append(b'x' * (8 * 1024 * 1024))  # written, so the pages count towards RSS\n"
+        "    time.sleep(8 / rate)\n"
+    ),
+    "io": (
+        "import os, sys\n"
+        "chunk = os.urandom(int(sys.argv[2]) * 1024 * 1024)\n"
+        "with open(sys.argv[1], 'wb') as f:\n"
+        "    while True:\n"
+        "        for _ in range(64):\n"
+        "            f.write(chunk)\n"
+        "            os.fsync(f.fileno())\n"
+        "        f.seek(0)\n"
+    ),
+}
+
+def start_stressor(kind, scratch_dir):
+    """Launch the child processes for one stress event and return them."""
+    python = [sys.executable, "-c", STRESSORS[kind]]
+    if kind == "cpu":
+        return [subprocess.Popen(python) for _ in range(psutil.cpu_count() or 1)]
+    if kind == "memory":
+        cap = min(MEMORY_CAP_MB, psutil.virtual_memory().available // (4 * 1024 * 1024))
+        return [subprocess.Popen(python + [str(MEMORY_RAMP_MB_PER_S), str(cap)])]
+    return [subprocess.Popen(python + [os.path.join(scratch_dir, "io_burst.bin"), str(IO_CHUNK_MB)])]
+
+def stop_stressor(children):
+    for child in children:
+        child.kill()
+        child.wait()
+
+def alert_kinds(lines, severe_only=True):
+    """Map report lines to the event kinds they alert on.
+
+    Severe lines start with ⚠️ or 🔴; with severe_only=False, moderate
+    lines ("Moderate ...", 🟠) count as well.
+    """
+    prefixes = ("⚠️", "🔴") if severe_only else ("⚠️", "🔴", "Moderate", "🟠")
+    kinds = set()
+    for line in lines:
+        if line.startswith(prefixes):
+            kinds.update(kind for kind, words in ALERT_KEYWORDS.items() if any(word in line for word in words))
+    return kinds
+
+def run_schedule(schedule=DEFAULT_SCHEDULE, tick=TICK_SECONDS):
+    """Run stress events on schedule while monitoring at a fixed tick.
+
+    Returns (events, ticks, overhead): per-event onset/end times, one row
+    per monitor tick with its alert and warning kinds and detector cost,
+    and the monitor process's own CPU and memory use.
+    """
+    schedule = sorted(schedule, key=lambda event: event[1])
+    total = max(start + duration for _, start, duration in schedule) + QUIET_TAIL_SECONDS
+    nic_speeds = get_nic_speeds()
+    leak_detector = LeakDetector(LEAK_HALF_LIFE_SECONDS, LEAK_SUSTAINED_SECONDS)
+    monitor = psutil.Process()
+    events = [{"Kind": kind, "Start": None, "End": None} for kind, _, _ in schedule]
+    running, ticks = {}, []
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        try:
+            origin = time.monotonic()
+            cpu_start = time.process_time()
+            prev = read_system_counters()
+            next_tick = tick
+            while next_tick <= total:
+                # Start and stop events on their own schedule, between ticks
+                for i, (kind, start, duration) in enumerate(schedule):
+                    elapsed = time.monotonic() - origin
+                    if events[i]["Start"] is None and elapsed >= start:
+                        running[i] = start_stressor(kind, scratch_dir)
+                        events[i]["Start"] = time.monotonic() - origin
+                    elif i in running and elapsed >= start + duration:
+                        stop_stressor(running.pop(i))
+                        events[i]["End"] = time.monotonic() - origin
+                boundaries = [t for _, s, d in schedule for t in (s, s + d) if t > time.monotonic() - origin]
+                wake = min([next_tick] + boundaries)
+                time.sleep(max(wake - (time.monotonic() - origin), 0))
+                if wake < next_tick:
+                    continue
+
+                work_start = time.perf_counter()
+                counters = read_system_counters()
+                sample, disk_rates, net_rates, cores = metrics_between(prev, counters, nic_speeds)
+                prev = counters
+                leak_detector.sample(ignore_pids=(monitor.pid,))
+                lines = detect_bottlenecks(sample, disk_rates, net_rates, cores, leaks=leak_detector.leaks())
+                lines += suggest_optimizations(sample, disk_rates, net_rates)
+                ticks.append({
+                    "Time": time.monotonic() - origin,
+                    "Alerts": sorted(alert_kinds(lines)),
+                    "Warnings": sorted(alert_kinds(lines, severe_only=False)),
+                    "Detect (ms)": (time.perf_counter() - work_start) * 1000,
+                })
+                next_tick += tick
+            wall = time.monotonic() - origin
+            overhead = {
+                "Monitor CPU (%)": (time.process_time() - cpu_start) / wall * 100,
+                "Detect (ms/tick)": float(np.mean([t["Detect (ms)"] for t in ticks])) if ticks else 0.0,
+                "Monitor RSS (MB)": monitor.memory_info().rss / 1024 ** 2,
+            }
+        finally:
+            for children in running.values():
+                stop_stressor(children)
+    return events, ticks, overhead
+
+def _first_hit(event, ticks, key):
+    """Seconds from the event's onset to the first tick flagging its kind under key, or NaN."""
+    end = (event["End"] if event["End"] is not None else np.inf) + RECOVERY_SECONDS
+    hits = [t["Time"] for t in ticks if event["Start"] < t["Time"] <= end and event["Kind"] in t[key]]
+    return round(hits[0] - event["Start"], 2) if hits else np.nan
+
+def score_run(events, ticks):
+    """Compute onset-to-alert latency per event and the quiet-period false-positive rate."""
+    rows = []
+    for event in events:
+        if event["Start"] is None:
+            continue
+        latency = _first_hit(event, ticks, "Alerts")
+        rows.append({
+            "Kind": event["Kind"],
+            "Duration (s)": round((event["End"] or event["Start"]) - event["Start"], 1),
+            "Detected": not np.isnan(latency),
+            "Latency (s)": latency,
+            "Warning Latency (s)": _first_hit(event, ticks, "Warnings"),
+        })
+
+    def busy(t):
+        return any(e["Start"] is not None and e["Start"] < t <= (e["End"] or np.inf) + RECOVERY_SECONDS for e in events)
+
+    quiet = [t for t in ticks if not busy(t["Time"])]
+    false_positives = [t for t in quiet if t["Alerts"]]
+    by_kind = {kind: sum(kind in t["Alerts"] for t in false_positives) for kind in ALERT_KEYWORDS}
+    summary = {
+        "Quiet Ticks": len(quiet),
+        "False Positive Rate": round(len(false_positives) / len(quiet), 3) if quiet else np.nan,
+        **{f"False Positives ({kind})": count for kind, count in by_kind.items()},
+    }
+    columns = ["Kind", "Duration (s)", "Detected", "Latency (s)", "Warning Latency (s)"]
+    return pd.DataFrame(rows, columns=columns), summary
+
+def git_revision():
+    """Short commit hash of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_report(schedule=DEFAULT_SCHEDULE, tick=TICK_SECONDS):
+    """Run the schedule and collect everything needed to compare two revisions."""
+    events, ticks, overhead = run_schedule(schedule, tick)
+    latencies, summary = score_run(events, ticks)
+    metrics = dict(summary)
+    for kind, group in latencies.groupby("Kind"):
+        metrics[f"Detection Rate ({kind})"] = round(float(group["Detected"].mean()), 3)
+        metrics[f"Latency ({kind}, s)"] = round(float(group["Latency (s)"].mean()), 2)
+        metrics[f"Warning Latency ({kind}, s)"] = round(float(group["Warning Latency (s)"].mean()), 2)
+    metrics.update({name: round(value, 2) for name, value in overhead.items()})
+    return {
+        "Revision": git_revision(),
+        "Timestamp": time.time(),
+        "Config": {"Tick (s)": tick, "Schedule": schedule, "CPUs": psutil.cpu_count(),
+                   "Leak Half-Life (s)": LEAK_HALF_LIFE_SECONDS, "Leak Sustained (s)": LEAK_SUSTAINED_SECONDS},
+        "Events": latencies.astype(object).where(latencies.notna(), None).to_dict("records"),
+        "Metrics": {name: (None if isinstance(v, float) and np.isnan(v) else v) for name, v in metrics.items()},
+    }
+
+def save_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare_reports(old, new):
+    """Side-by-side metrics of two reports with the change from old to new."""
+    names = list(dict.fromkeys(list(old["Metrics"]) + list(new["Metrics"])))
+    before = pd.to_numeric(pd.Series([old["Metrics"].get(name) for name in names]), errors="coerce")
+    after = pd.to_numeric(pd.Series([new["Metrics"].get(name) for name in names]), errors="coerce")
+    return pd.DataFrame({
+        "Metric": names,
+        f"Old ({old['Revision']})": before,
+        f"New ({new['Revision']})": after,
+        "Change": (after - before).round(3),
+    })
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure how quickly the detectors notice injected load.")
+    parser.add_argument("--output", default="detection_report.json", help="where to write the JSON report")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--tick", type=float, default=TICK_SECONDS, help="monitor sampling interval in seconds")
+    args = parser.parse_args()
+
+    report = build_report(tick=args.tick)
+    save_report(report, args.output)
+    print(pd.DataFrame(report["Events"]).to_string(index=False), "\n")
+    if args.baseline:
+        print(compare_reports(load_report(args.baseline), report).to_string(index=False))
+    else:
+        print(pd.Series(report["Metrics"]).to_string())
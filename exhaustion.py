@@ -0,0 +1,155 @@
+import time
+import numpy as np
+import pandas as pd
+import psutil
+from processes import scan_processes
+
+# Defaults
+WINDOW_SECONDS = 30 * 60  # rolling window used for the trend fits
+MIN_POINTS = 5
+CONFIDENCE_Z = 1.96  # ~95% two-sided
+CRITICAL_ETA = 24 * 3600
+WARNING_ETA = 7 * 24 * 3600
+TOP_ETAS = 5
+IGNORED_FSTYPES = ("squashfs", "iso9660", "tmpfs", "devtmpfs", "overlay")
+
+def _snapshot(processes=None):
+    """Return {target: (used, limit)} for filesystems, memory, swap and every process RSS.
+
+    processes is a scan_processes() result to reuse; by default the process table is read here.
+    """
+    targets = {}
+    for part in psutil.disk_partitions(all=False):
+        if part.fstype in IGNORED_FSTYPES:
+            continue
+        try:
+            usage = psutil.disk_usage(part.mountpoint)
+        except OSError:
+            continue
+        # used + free excludes blocks reserved for root, which users cannot fill
+        targets[("Filesystem", part.mountpoint)] = (usage.used, usage.used + usage.free)
+
+    memory = psutil.virtual_memory()
+    targets[("Memory", "RAM")] = (memory.total - memory.available, memory.total)
+    swap = psutil.swap_memory()
+    if swap.total:
+        targets[("Memory", "Swap")] = (swap.used, swap.total)
+
+    for info in scan_processes() if processes is None else processes:
+        if info["memory_info"] is None:
+            continue
+        rss = info["memory_info"].rss
+        # A process can grow until it has taken everything currently available
+        targets[("Process", f"{info['name']} (PID {info['pid']})")] = (rss, rss + memory.available)
+    return targets
+
+class ExhaustionTracker:
+    """Keeps a rolling window of resource usage snapshots for ETA estimation."""
+
+    def __init__(self, window_seconds=WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self.timestamps = []
+        self.snapshots = []
+
+    def sample(self, snapshot=None, timestamp=None, processes=None):
+        """Record one snapshot (built from processes if given) and drop those older than the window."""
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+        self.snapshots.append(_snapshot(processes) if snapshot is None else snapshot)
+        cutoff = self.timestamps[-1] - self.window_seconds
+        while self.timestamps and self.timestamps[0] < cutoff:
+            self.timestamps.pop(0)
+            self.snapshots.pop(0)
+
+    def matrices(self):
+        """Return (target keys, timestamps, used targets x time, latest limits)."""
+        keys = sorted({key for snap in self.snapshots for key in snap})
+        index = {key: i for i, key in enumerate(keys)}
+        used = np.full((len(keys), len(self.snapshots)), np.nan)
+        limits = np.full(len(keys), np.nan)
+        for t, snap in enumerate(self.snapshots):
+            for key, (value, limit) in snap.items():
+                used[index[key], t] = value
+                limits[index[key]] = limit
+        return keys, np.array(self.timestamps, dtype=float), used, limits
+
+    def estimate(self):
+        """Estimate time to exhaustion for every tracked target."""
+        keys, timestamps, used, limits = self.matrices()
+        return estimate_exhaustion(keys, timestamps, used, limits)
+
+def fit_trends(timestamps, values):
+    """Least-squares line per row of a targets x time matrix, ignoring NaNs.
+
+    Returns (slope, level at the last timestamp, slope standard error, points used).
+    """
+    mask = ~np.isnan(values)
+    n = mask.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    t = timestamps - timestamps[-1]  # centre on "now" so the intercept is the current level
+    t_mean = (mask * t).sum(axis=1) / safe_n
+    y_mean = np.where(mask, values, 0).sum(axis=1) / safe_n
+    dt = np.where(mask, t - t_mean[:, None], 0)
+    dy = np.where(mask, values - y_mean[:, None], 0)
+    s_tt = (dt ** 2).sum(axis=1)
+    s_tt[s_tt == 0] = np.inf
+    slope = (dt * dy).sum(axis=1) / s_tt
+    level = y_mean - slope * t_mean
+    residual_var = ((dy - slope[:, None] * dt) ** 2).sum(axis=1) / np.maximum(n - 2, 1)
+    slope_se = np.sqrt(residual_var / s_tt)
+    return slope, level, slope_se, n
+
+def estimate_exhaustion(keys, timestamps, used, limits, z=CONFIDENCE_Z):
+    """Compute ETA (seconds) to each target's limit with a confidence interval.
+
+    ETA Low uses the upper confidence bound of the growth rate, ETA High the
+    lower one. Targets whose growth is not significant (the lower bound is
+    not above zero) are omitted, so noise never shows up as an ETA. Result
+    is sorted soonest first.
+    """
+    columns = ["Kind", "Target", "Used", "Limit", "Growth/h", "ETA (s)", "ETA Low (s)", "ETA High (s)"]
+    if len(timestamps) < 2 or len(keys) == 0:
+        return pd.DataFrame(columns=columns)
+    slope, level, slope_se, n = fit_trends(timestamps, used)
+    headroom = np.maximum(limits - level, 0)
+    slope_hi, slope_lo = slope + z * slope_se, slope - z * slope_se
+    # Skip targets that are gone (exited processes, unmounted filesystems)
+    growing = (slope_lo > 0) & (n >= MIN_POINTS) & ~np.isnan(limits) & ~np.isnan(used[:, -1])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta = np.where(growing, headroom / slope, np.inf)
+        eta_low = np.where(growing, headroom / slope_hi, np.inf)
+        eta_high = np.where(growing, headroom / slope_lo, np.inf)
+
+    rows = np.flatnonzero(growing)
+    result = pd.DataFrame({
+        "Kind": [keys[i][0] for i in rows],
+        "Target": [keys[i][1] for i in rows],
+        "Used": level[rows],
+        "Limit": limits[rows],
+        "Growth/h": slope[rows] * 3600,
+        "ETA (s)": eta[rows],
+        "ETA Low (s)": eta_low[rows],
+        "ETA High (s)": eta_high[rows],
+    }, columns=columns)
+    return result.sort_values("ETA (s)").reset_index(drop=True)
+
+def format_duration(seconds):
+    """Render seconds as a short human duration."""
+    if not np.isfinite(seconds):
+        return "never"
+    for unit, size in (("d", 86400), ("h", 3600), ("min", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.1f} {unit}"
+    return f"{seconds:.0f} s"
+
+def format_etas(etas, top=TOP_ETAS):
+    """Render the soonest-to-fail targets as optimization suggestion lines."""
+    lines = []
+    for row in etas.head(top).to_dict("records"):
+        if row["ETA (s)"] > WARNING_ETA:
+            continue
+        icon = "🔴" if row["ETA (s)"] <= CRITICAL_ETA else "🟠"
+        lines.append(f"{icon} {row['Kind']} {row['Target']} projected to run out in ~{format_duration(row['ETA (s)'])} "
+                     f"(95% range {format_duration(row['ETA Low (s)'])} – {format_duration(row['ETA High (s)'])}, "
+                     f"growing {row['Growth/h'] / 1024 ** 2:.1f} MB/h)")
+    return lines
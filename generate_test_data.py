@@ -1,5 +1,6 @@
 import os
 import random
+import time
 import pandas as pd
 from collections import Counter
 
@@ -30,16 +31,17 @@ def generate_random_usage_data(max_intervals=50, cpu_base_range=(15, 30), mem_ba
     base_cpu = random.uniform(*cpu_base_range)  # Default: 15-30%
     base_memory = random.uniform(*mem_base_range)  # Default: 20-40%
     
-    time_units = []
+    timestamps = []
     cpu_usage = []
     memory_usage = []
-    current_time = 0
+    # Epoch seconds, ending at the moment the data is generated
+    current_time = time.time() - num_intervals * time_step * 60
     
     print(f"Using consistent time interval of {time_step} minutes for this run")
     
     for i in range(num_intervals):
-        current_time += time_step
-        time_units.append(f"{current_time} Min")
+        current_time += time_step * 60
+        timestamps.append(round(current_time, 3))
         
         # CPU usage: smaller trend for realism
         cpu_trend = base_cpu + (i * random.uniform(0, 0.3))  # Max 0.3% increase per step
@@ -54,7 +56,7 @@ def generate_random_usage_data(max_intervals=50, cpu_base_range=(15, 30), mem_ba
         memory_usage.append(current_memory)
     
     data = {
-        "Time (Unit)": time_units,
+        "Timestamp": timestamps,
         "CPU Usage": cpu_usage,
         "Memory Usage": memory_usage
     }
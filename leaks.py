@@ -0,0 +1,233 @@
+import time
+import numpy as np
+import pandas as pd
+from exhaustion import format_duration
+from processes import scan_processes
+
+# Defaults
+HALF_LIFE_SECONDS = 30 * 60  # weight of a sample halves after this long
+MIN_SAMPLES = 10
+SUSTAINED_SECONDS = 20 * 60  # growth must hold this long before it is reported
+MIN_LEAK_MB_PER_HOUR = 1.0
+LEAK_HIGH_MB_PER_HOUR = 50.0
+MIN_T_STAT = 4.0  # slope must be this many standard errors above zero
+ROBUST_K = 3.0  # residuals beyond this many scale units are clipped
+MIN_SCALE_MB = 0.25
+SCALE_ALPHA = 0.1
+WARMUP_CLIP_FRACTION = 0.1  # before the scale is calibrated, clip jumps above 10% of RSS
+SHIFT_RUN = 3  # this many clipped samples in a row is a level shift, not an outlier
+INITIAL_SLOTS = 256
+TOP_LEAKS = 5
+BYTES_PER_MB = 1024 * 1024
+CONFIRM_HALF_LIFE_RATIO = 0.25  # the confirming fit forgets four times faster
+CONFIRM_FRACTION = 0.5  # recent growth must be at least this share of the long-run rate
+
+class _DecayedFit:
+    """Exponentially decayed weighted least-squares sums, one slot per process.
+
+    Time is measured relative to the latest update, so the intercept is the
+    current level and new points add nothing to the time sums.
+    """
+
+    FIELDS = ("w", "w2", "t", "y", "tt", "ty", "yy")
+
+    def __init__(self, half_life, size):
+        self.half_life = half_life
+        self.sums = {name: np.zeros(size) for name in self.FIELDS}
+
+    def grow(self, size):
+        for name, values in self.sums.items():
+            self.sums[name] = np.concatenate([values, np.zeros(size - len(values))])
+
+    def clear(self, slots):
+        for values in self.sums.values():
+            values[slots] = 0.0
+
+    def decay(self, dt):
+        """Age every slot's sums by dt seconds and move their time origin to now."""
+        s = self.sums
+        decay = 0.5 ** (dt / self.half_life)
+        # Substituting t -> t - dt in each sum; order matters since tt and ty read the old t and w
+        s["tt"] = decay * (s["tt"] - 2 * dt * s["t"] + dt * dt * s["w"])
+        s["ty"] = decay * (s["ty"] - dt * s["y"])
+        s["t"] = decay * (s["t"] - dt * s["w"])
+        for name in ("w", "y", "yy"):
+            s[name] *= decay
+        s["w2"] *= decay * decay
+
+    def add(self, idx, y):
+        s = self.sums
+        s["w"][idx] += 1
+        s["w2"][idx] += 1
+        s["y"][idx] += y
+        s["yy"][idx] += y * y
+
+    def fit(self, idx):
+        """Return (slope per second, level now, slope standard error) for the given slots."""
+        s = self.sums
+        w = np.maximum(s["w"][idx], 1e-12)
+        t, y = s["t"][idx], s["y"][idx]
+        s_tt = s["tt"][idx] - t * t / w
+        s_ty = s["ty"][idx] - t * y / w
+        s_yy = s["yy"][idx] - y * y / w
+        valid = s_tt > 1e-9
+        s_tt = np.where(valid, s_tt, 1)
+        slope = np.where(valid, s_ty / s_tt, 0.0)
+        level = (y - slope * t) / w
+        n_eff = w * w / np.maximum(s["w2"][idx], 1e-12)
+        sigma2 = np.maximum(s_yy - slope * s_ty, 0) / w * n_eff / np.maximum(n_eff - 2, 1)
+        slope_se = np.where(valid, np.sqrt(sigma2 * w / (n_eff * s_tt)), np.inf)
+        return slope, level, slope_se
+
+class LeakDetector:
+    """Online per-process RSS trend detector with bounded memory.
+
+    Each process owns one slot of fixed-size state: decayed least-squares
+    sums over (time, RSS) for a long and a short half-life, plus a robust
+    residual scale. Every tick ages all sums, clips upward residuals to
+    ROBUST_K scale units (so transient allocation bursts barely move the
+    slope; frees pass through, so GC sawtooths stay flat) and folds the
+    sample in; SHIFT_RUN clipped samples in a row restart the slot's fits
+    at the new level. A leak is growth that is significant on the long fit
+    and kept up on the short one (a one-off step or a GC cycle fades there
+    first), held for sustained_seconds. Slots of exited processes are
+    recycled, so memory tracks the live process count however long the
+    detector runs.
+    """
+
+    def __init__(self, half_life_seconds=HALF_LIFE_SECONDS, sustained_seconds=SUSTAINED_SECONDS):
+        self.sustained_seconds = sustained_seconds
+        self.slots = {}  # (pid, name) -> slot index
+        self.free = list(range(INITIAL_SLOTS - 1, -1, -1))
+        self.pids = np.zeros(INITIAL_SLOTS, dtype=np.int64)
+        self.names = np.empty(INITIAL_SLOTS, dtype=object)
+        self.long = _DecayedFit(half_life_seconds, INITIAL_SLOTS)
+        self.short = _DecayedFit(half_life_seconds * CONFIRM_HALF_LIFE_RATIO, INITIAL_SLOTS)
+        self.scale = np.zeros(INITIAL_SLOTS)
+        self.count = np.zeros(INITIAL_SLOTS, dtype=np.int64)
+        self.growing_since = np.full(INITIAL_SLOTS, np.nan)
+        self.clip_run = np.zeros(INITIAL_SLOTS, dtype=np.int64)
+        self.last_time = None
+
+    def _allocate(self, key):
+        """Return a zeroed slot for a newly seen process."""
+        if not self.free:
+            size = len(self.pids)
+            self.pids = np.concatenate([self.pids, np.zeros(size, dtype=np.int64)])
+            self.names = np.concatenate([self.names, np.empty(size, dtype=object)])
+            self.scale = np.concatenate([self.scale, np.zeros(size)])
+            self.growing_since = np.concatenate([self.growing_since, np.full(size, np.nan)])
+            self.count, self.clip_run = (np.concatenate([a, np.zeros(size, dtype=np.int64)]) for a in (self.count, self.clip_run))
+            self.long.grow(2 * size)
+            self.short.grow(2 * size)
+            self.free.extend(range(2 * size - 1, size - 1, -1))
+        slot = self.free.pop()
+        self.slots[key] = slot
+        self.pids[slot], self.names[slot] = key
+        return slot
+
+    def _release(self, keys):
+        """Zero and recycle the slots of exited processes."""
+        for key in keys:
+            slot = self.slots.pop(key)
+            self.long.clear(slot)
+            self.short.clear(slot)
+            self.scale[slot] = self.count[slot] = self.clip_run[slot] = 0
+            self.growing_since[slot] = np.nan
+            self.names[slot] = None
+            self.free.append(slot)
+
+    def update(self, pids, names, rss, timestamp=None):
+        """Fold one RSS reading (bytes) per live process into the trend state."""
+        now = time.time() if timestamp is None else timestamp
+        if self.last_time is not None:
+            self.long.decay(now - self.last_time)
+            self.short.decay(now - self.last_time)
+        self.last_time = now
+
+        keys = list(zip(pids, names))
+        self._release(self.slots.keys() - set(keys))
+        idx = np.fromiter((self.slots[key] if key in self.slots else self._allocate(key) for key in keys),
+                          dtype=np.int64, count=len(keys))
+        y = np.asarray(rss, dtype=float) / BYTES_PER_MB
+
+        count = self.count[idx]
+        _, level, _ = self.long.fit(idx)
+        predicted = np.where(count >= 2, level, y)
+        residual = y - predicted
+        # Until a warm-up has calibrated the scale, only clip jumps that are large relative to RSS
+        limit = np.where(count >= MIN_SAMPLES, ROBUST_K * np.maximum(self.scale[idx], MIN_SCALE_MB),
+                         WARMUP_CLIP_FRACTION * np.abs(predicted))
+        # Nothing is clipped until the fit has a slope, so a fast ramp is not mistaken for a jump
+        clipped = np.where(count >= 3, np.minimum(residual, limit), residual)
+        alpha = np.maximum(1 / np.maximum(count - 1, 1), SCALE_ALPHA)
+        self.scale[idx] += np.where(count >= 2, alpha * (np.abs(clipped) - self.scale[idx]), 0.0)
+        y = predicted + clipped
+
+        # A sustained jump (e.g. a cache being filled) restarts the trend at the new level
+        self.clip_run[idx] = np.where(clipped < residual, self.clip_run[idx] + 1, 0)
+        shifted = self.clip_run[idx] >= SHIFT_RUN
+        if shifted.any():
+            restart = idx[shifted]
+            self.long.clear(restart)
+            self.short.clear(restart)
+            self.clip_run[restart] = 0
+            count[shifted] = 0
+            y[shifted] = predicted[shifted] + residual[shifted]
+        self.long.add(idx, y)
+        self.short.add(idx, y)
+        self.count[idx] = count + 1
+
+        slope, _, slope_se = self.long.fit(idx)
+        recent_slope, _, _ = self.short.fit(idx)
+        growing = ((self.count[idx] >= MIN_SAMPLES) & (slope * 3600 >= MIN_LEAK_MB_PER_HOUR)
+                   & (slope > MIN_T_STAT * slope_se) & (recent_slope >= CONFIRM_FRACTION * slope))
+        since = self.growing_since[idx]
+        self.growing_since[idx] = np.where(growing, np.where(np.isnan(since), now, since), np.nan)
+
+    def sample(self, timestamp=None, ignore_pids=(), processes=None):
+        """Update the detector from every process except ignore_pids (a scan_processes() result, or a fresh one)."""
+        pids, names, rss = [], [], []
+        for info in scan_processes() if processes is None else processes:
+            if info["memory_info"] is None or info["pid"] in ignore_pids:
+                continue
+            pids.append(info["pid"])
+            names.append(info["name"])
+            rss.append(info["memory_info"].rss)
+        self.update(pids, names, rss, timestamp)
+
+    def leaks(self):
+        """Return processes with sustained RSS growth, fastest first."""
+        columns = ["PID", "Name", "RSS (MB)", "Leak Rate (MB/h)", "Rate Low (MB/h)", "Growing (s)"]
+        idx = np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+        if len(idx):
+            idx = idx[self.last_time - self.growing_since[idx] >= self.sustained_seconds]
+        if len(idx) == 0:
+            return pd.DataFrame(columns=columns)
+        slope, level, slope_se = self.long.fit(idx)
+        result = pd.DataFrame({
+            "PID": self.pids[idx],
+            "Name": self.names[idx],
+            "RSS (MB)": np.round(level, 1),
+            "Leak Rate (MB/h)": np.round(slope * 3600, 2),
+            "Rate Low (MB/h)": np.round((slope - 1.96 * slope_se) * 3600, 2),
+            "Growing (s)": np.round(self.last_time - self.growing_since[idx]),
+        }, columns=columns)
+        return result.sort_values("Leak Rate (MB/h)", ascending=False).reset_index(drop=True)
+
+def format_leaks(leaks, top=TOP_LEAKS):
+    """Render suspected leaks as bottleneck report lines."""
+    lines = []
+    for row in leaks.head(top).to_dict("records"):
+        severity = "⚠️ High" if row["Leak Rate (MB/h)"] >= LEAK_HIGH_MB_PER_HOUR else "Moderate"
+        lines.append(f"{severity} Memory Growth in {row['Name']} (PID {row['PID']}): possible leak of "
+                     f"~{row['Leak Rate (MB/h)']} MB/h (at least {max(row['Rate Low (MB/h)'], 0)} MB/h) "
+                     f"for {format_duration(row['Growing (s)'])}, RSS now {row['RSS (MB)']} MB")
+    return lines
+
+if __name__ == "__main__":
+    detector = LeakDetector()
+    while True:
+        detector.sample()
+        print(detector.leaks().to_string(index=False), "\n")
+        time.sleep(10)
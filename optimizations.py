@@ -1,10 +1,44 @@
 import psutil
+from performance import sample_system_metrics
+from exhaustion import format_etas
+from bottlenecks import (DISK_UTIL_HIGH, DISK_UTIL_MODERATE, DISK_AWAIT_HIGH_MS, NET_UTIL_HIGH, NET_UTIL_MODERATE,
+                         NET_ERROR_HIGH, NET_ERROR_MODERATE, net_error_percent)
 
-def suggest_optimizations():
+def suggest_io_optimizations(disk_rates, net_rates):
+    """Suggest fixes for saturated disks and network interfaces."""
     optimizations = []
 
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
+    for disk in disk_rates.to_dict("records"):
+        name, util, await_ms = disk["Device"], disk["Util (%)"], disk["Await (ms)"]
+        if util > DISK_UTIL_HIGH or (await_ms > DISK_AWAIT_HIGH_MS and util > DISK_UTIL_MODERATE):
+            optimizations.append(f"🔴 Disk {name} is saturated ({util}% busy, {await_ms} ms await). "
+                                 "Batch small writes, add caching or move hot data to faster storage.")
+        elif util > DISK_UTIL_MODERATE:
+            optimizations.append(f"🟠 Disk {name} is moderately busy ({util}%). Watch for I/O-heavy jobs.")
+
+    for nic in net_rates.to_dict("records"):
+        name, util = nic["Interface"], nic["Util (%)"]
+        if util > NET_UTIL_HIGH:
+            optimizations.append(f"🔴 Network interface {name} is near link capacity ({util}%). "
+                                 "Compress transfers, throttle bulk jobs or upgrade the link.")
+        elif util > NET_UTIL_MODERATE:
+            optimizations.append(f"🟠 Network interface {name} is moderately loaded ({util}%).")
+        error_pct = net_error_percent(nic)
+        if error_pct > NET_ERROR_HIGH:
+            optimizations.append(f"🔴 {error_pct}% of packets on {name} are errors or drops. "
+                                 "Check cabling, driver and buffer sizes.")
+        elif error_pct > NET_ERROR_MODERATE:
+            optimizations.append(f"🟠 Some packet errors or drops on {name} ({error_pct}%). Watch the interface counters.")
+
+    return optimizations
+
+def suggest_optimizations(sample=None, disk_rates=None, net_rates=None, etas=None):
+    optimizations = []
+
+    if sample is None:
+        sample, disk_rates, net_rates, _ = sample_system_metrics(interval=1)
+    cpu_percent = sample["CPU Usage"]
+    memory_percent = sample["Memory Usage"]
     disk = psutil.disk_usage('/')
 
     if cpu_percent > 80:
@@ -12,9 +46,9 @@ def suggest_optimizations():
     elif cpu_percent > 50:
         optimizations.append("🟠 Moderate CPU usage. Monitor active tasks.")
 
-    if memory.percent > 80:
+    if memory_percent > 80:
         optimizations.append("🔴 High RAM usage. Close unused programs or upgrade RAM.")
-    elif memory.percent > 50:
+    elif memory_percent > 50:
         optimizations.append("🟠 Moderate memory usage. Optimize memory-intensive tasks.")
 
     if disk.percent > 85:
@@ -22,6 +56,10 @@ def suggest_optimizations():
     elif disk.percent > 70:
         optimizations.append("🟠 Disk space usage high. Consider cleaning temporary files.")
 
+    optimizations.extend(suggest_io_optimizations(disk_rates, net_rates))
+    if etas is not None:
+        optimizations.extend(format_etas(etas))
+
     if not optimizations:
         optimizations.append("✅ System performance is optimal. No action needed.")
 
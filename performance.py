@@ -1,11 +1,17 @@
+import os
 import psutil
 import numpy as np
 import pandas as pd
 import time
 from sklearn.linear_model import LinearRegression
+from cpu_cores import read_core_times, core_percentages, core_metrics, mean_busy, CORE_METRICS
+from timeseries import TIMESTAMP, format_time_values, make_history, from_time_labels, elapsed_seconds
 
 # Constants
 PAST_INTERVALS = 25
+BYTES_PER_MB = 1024 * 1024
+IGNORED_DISK_PREFIXES = ("loop", "ram", "zram", "fd", "sr")
+IGNORED_NICS = ("lo",)
 
 def get_real_time_metrics():
     """Get current CPU and memory usage metrics."""
@@ -30,88 +36,210 @@ def detect_performance_issues():
         results.append("✅ No significant performance issues detected")
     return results
 
+def _is_physical_disk(name):
+    """Return True for whole block devices, skipping partitions and virtual devices."""
+    if name.startswith(IGNORED_DISK_PREFIXES):
+        return False
+    if os.path.isdir("/sys/block"):
+        return os.path.exists(f"/sys/block/{name}")
+    return True
+
+def get_nic_speeds():
+    """Return link speed in Mbit/s per network interface (0 when unknown)."""
+    return {nic: stats.speed for nic, stats in psutil.net_if_stats().items()}
+
+def read_io_counters():
+    """Snapshot per-disk and per-NIC I/O counters with a monotonic timestamp."""
+    disks = psutil.disk_io_counters(perdisk=True) or {}
+    nics = psutil.net_io_counters(pernic=True) or {}
+    return {
+        "time": time.monotonic(),
+        "disk": {name: c for name, c in disks.items() if _is_physical_disk(name)},
+        "net": {name: c for name, c in nics.items() if name not in IGNORED_NICS},
+    }
+
+def _delta(curr, prev, field):
+    """Counter delta that treats wraps and resets as zero."""
+    return max(getattr(curr, field, 0) - getattr(prev, field, 0), 0)
+
+def compute_io_rates(prev, curr, nic_speeds=None):
+    """Compute per-disk and per-NIC rates from two I/O counter snapshots."""
+    elapsed = max(curr["time"] - prev["time"], 1e-6)
+    nic_speeds = nic_speeds or {}
+
+    disk_rows = []
+    for name, c in curr["disk"].items():
+        p = prev["disk"].get(name)
+        if p is None:
+            continue
+        reads = _delta(c, p, "read_count")
+        writes = _delta(c, p, "write_count")
+        ops = reads + writes
+        io_time_ms = _delta(c, p, "read_time") + _delta(c, p, "write_time")
+        # busy_time is only reported on Linux/FreeBSD
+        util = _delta(c, p, "busy_time") / (elapsed * 1000) * 100 if hasattr(c, "busy_time") else np.nan
+        disk_rows.append({
+            "Device": name,
+            "Read (MB/s)": round(_delta(c, p, "read_bytes") / BYTES_PER_MB / elapsed, 2),
+            "Write (MB/s)": round(_delta(c, p, "write_bytes") / BYTES_PER_MB / elapsed, 2),
+            "Read IOPS": round(reads / elapsed, 1),
+            "Write IOPS": round(writes / elapsed, 1),
+            "Util (%)": round(min(util, 100.0), 1),
+            "Await (ms)": round(io_time_ms / ops, 2) if ops else 0.0,
+        })
+
+    net_rows = []
+    for name, c in curr["net"].items():
+        p = prev["net"].get(name)
+        if p is None:
+            continue
+        recv = _delta(c, p, "bytes_recv") / elapsed
+        sent = _delta(c, p, "bytes_sent") / elapsed
+        speed_mbit = nic_speeds.get(name, 0)
+        # Full duplex: utilisation is the busier direction against link speed
+        util = max(recv, sent) * 8 / (speed_mbit * 1e6) * 100 if speed_mbit else np.nan
+        net_rows.append({
+            "Interface": name,
+            "Recv (MB/s)": round(recv / BYTES_PER_MB, 3),
+            "Sent (MB/s)": round(sent / BYTES_PER_MB, 3),
+            "Packets In/s": round(_delta(c, p, "packets_recv") / elapsed, 1),
+            "Packets Out/s": round(_delta(c, p, "packets_sent") / elapsed, 1),
+            "Errors/s": round((_delta(c, p, "errin") + _delta(c, p, "errout")) / elapsed, 2),
+            "Drops/s": round((_delta(c, p, "dropin") + _delta(c, p, "dropout")) / elapsed, 2),
+            "Util (%)": round(min(util, 100.0), 1),
+        })
+
+    disk_columns = ["Device", "Read (MB/s)", "Write (MB/s)", "Read IOPS", "Write IOPS", "Util (%)", "Await (ms)"]
+    net_columns = ["Interface", "Recv (MB/s)", "Sent (MB/s)", "Packets In/s", "Packets Out/s",
+                   "Errors/s", "Drops/s", "Util (%)"]
+    return pd.DataFrame(disk_rows, columns=disk_columns), pd.DataFrame(net_rows, columns=net_columns)
+
+def summarize_io_rates(disk_rates, net_rates):
+    """Collapse per-device rates into system-wide history columns."""
+    def peak(series):
+        return round(float(series.max()), 2) if series.notna().any() else 0.0
+
+    return {
+        "Disk Read (MB/s)": round(float(disk_rates["Read (MB/s)"].sum()), 2),
+        "Disk Write (MB/s)": round(float(disk_rates["Write (MB/s)"].sum()), 2),
+        "Disk IOPS": round(float((disk_rates["Read IOPS"] + disk_rates["Write IOPS"]).sum()), 1),
+        "Disk Util (%)": peak(disk_rates["Util (%)"]),
+        "Disk Await (ms)": peak(disk_rates["Await (ms)"]),
+        "Net Recv (MB/s)": round(float(net_rates["Recv (MB/s)"].sum()), 3),
+        "Net Sent (MB/s)": round(float(net_rates["Sent (MB/s)"].sum()), 3),
+        "Net Util (%)": peak(net_rates["Util (%)"]),
+    }
+
+def summarize_core_metrics(metrics):
+    """Collapse cores x CORE_METRICS into system-wide history columns, skipping cores without a reading."""
+    metrics = metrics[~np.isnan(metrics[:, 0])] if metrics.size else metrics
+    if metrics.size == 0:
+        return {"Max Core (%)": np.nan, "IO Wait (%)": np.nan, "Steal (%)": np.nan}
+    column = {name: metrics[:, i] for i, name in enumerate(CORE_METRICS)}
+    return {
+        "Max Core (%)": round(float(column["busy"].max()), 1),
+        "IO Wait (%)": round(float(column["iowait"].mean()), 1),
+        "Steal (%)": round(float(column["steal"].mean()), 1),
+    }
+
+def read_system_counters():
+    """Snapshot every cumulative counter the samplers turn into rates."""
+    return {"io": read_io_counters(), "cores": read_core_times()}
+
+def metrics_between(before, after, nic_speeds=None):
+    """Build one sample from two read_system_counters snapshots without blocking.
+
+    Returns the system-wide sample, per-disk and per-NIC rates, and
+    (core ids, cores x CORE_METRICS percentages). CPU figures are NaN when
+    the snapshots are too close together to measure any core.
+    """
+    disk_rates, net_rates = compute_io_rates(before["io"], after["io"], nic_speeds)
+    core_ids, core_pct = core_percentages(before["cores"], after["cores"])
+    cores = core_metrics(core_pct)
+    cpu_usage = round(mean_busy(cores), 1)
+    sample = {"CPU Usage": cpu_usage, "Memory Usage": psutil.virtual_memory().percent}
+    sample.update(summarize_core_metrics(cores))
+    sample.update(summarize_io_rates(disk_rates, net_rates))
+    return sample, disk_rates, net_rates, (core_ids, cores)
+
+def sample_system_metrics(interval=1, nic_speeds=None):
+    """Sample CPU, per-core, memory and disk/network rates over one blocking interval."""
+    if nic_speeds is None:
+        nic_speeds = get_nic_speeds()
+    before = read_system_counters()
+    time.sleep(interval)
+    return metrics_between(before, read_system_counters(), nic_speeds)
+
 def get_system_uptime():
     """Return system uptime in seconds."""
     return time.time() - psutil.boot_time()
 
-def format_time_values(time_values):
-    """Convert time values to appropriate units."""
-    time_unit = "Seconds"
-    if max(time_values) >= 60:
-        time_values = time_values / 60
-        time_unit = "Minutes"
-    if max(time_values) >= 60:
-        time_values = time_values / 60
-        time_unit = "Hours"
-    return time_values, time_unit
-
 def get_past_system_metrics():
-    """Collect past system metrics over PAST_INTERVALS."""
-    uptime = get_system_uptime()
-    time_points = np.linspace(0, uptime, num=PAST_INTERVALS)
-    time_points, time_unit = format_time_values(time_points)
-
-    history = []
-    for idx, t in enumerate(time_points, start=1):
-        cpu_usage = psutil.cpu_percent(interval=0.5)
-        memory_usage = psutil.virtual_memory().percent
-        time_with_unit = f"{round(t, 2)} {time_unit[:3]}"
-        history.append([idx, time_with_unit, cpu_usage, memory_usage])
-
-    df = pd.DataFrame(history, columns=["Index", "Time (Unit)", "CPU Usage", "Memory Usage"])
-    df.set_index("Index", inplace=True)
+    """Collect PAST_INTERVALS timestamped samples of system metrics."""
+    nic_speeds = get_nic_speeds()
+    timestamps, history = [], []
+    for _ in range(PAST_INTERVALS):
+        sample, _, _, _ = sample_system_metrics(interval=0.5, nic_speeds=nic_speeds)
+        timestamps.append(time.time())
+        history.append(sample)
+
+    df = make_history(timestamps, history)
+    _, time_unit = format_time_values(elapsed_seconds(df))
     return df, time_unit
 
 def load_user_data_from_csv(csv_path):
-    """Load user-provided CPU and memory data from a CSV file."""
+    """Load user-provided CPU and memory data from a CSV file.
+
+    Files carry either a numeric Timestamp column (epoch seconds) or legacy
+    "Time (Unit)" offsets, which are anchored so the last row falls at the
+    file's modification time.
+    """
     try:
         df = pd.read_csv(csv_path)
-        required_columns = ["Time (Unit)", "CPU Usage", "Memory Usage"]
-        if not all(col in df.columns for col in required_columns):
-            raise ValueError("CSV must contain 'Time (Unit)', 'CPU Usage', 'Memory Usage' columns")
-        df["Index"] = range(1, len(df) + 1)
-        df.set_index("Index", inplace=True)
-        return df
+        if not all(col in df.columns for col in ["CPU Usage", "Memory Usage"]) or \
+                not (TIMESTAMP in df.columns or "Time (Unit)" in df.columns):
+            raise ValueError("CSV must contain 'Timestamp' (or 'Time (Unit)'), 'CPU Usage', 'Memory Usage' columns")
+        if TIMESTAMP in df.columns:
+            return make_history(df.pop(TIMESTAMP), df.drop(columns=["Time (Unit)"], errors="ignore").to_dict("list"))
+        return from_time_labels(df, anchor=os.path.getmtime(csv_path))
     except Exception as e:
         raise ValueError(f"Error loading CSV: {str(e)}")
 
-def generate_future_time_series(total_period_min, interval_min):
-    """Generate future time points for prediction."""
-    intervals = int(total_period_min / interval_min)
-    return [f"{i * interval_min} Min" for i in range(1, intervals + 1)]
-
-def predict_future_trends(past_data, total_period_hours=1, interval_min=5):
-    """Predict future CPU and memory usage using linear regression."""
+def project_trends(origin, last_minute, cpu_line, mem_line, cpu_std, mem_std, total_period_hours=1, interval_min=5):
+    """Project fitted (slope, intercept) lines over minutes since origin into a forecast frame."""
     total_period_min = total_period_hours * 60
-    X = np.array(range(1, len(past_data) + 1)).reshape(-1, 1)
-    y_cpu = np.array(past_data["CPU Usage"]).reshape(-1, 1)
-    y_mem = np.array(past_data["Memory Usage"]).reshape(-1, 1)
-
-    model_cpu = LinearRegression().fit(X, y_cpu)
-    model_mem = LinearRegression().fit(X, y_mem)
-
     future_intervals = int(total_period_min / interval_min)
-    future_indices = np.array(range(1, future_intervals + 1)).reshape(-1, 1)
-    
-    future_cpu = model_cpu.predict(future_indices).flatten()
-    future_mem = model_mem.predict(future_indices).flatten()
+    future_minutes = last_minute + interval_min * np.arange(1, future_intervals + 1)
 
-    cpu_variation = np.std(y_cpu) * np.random.uniform(-0.5, 0.5, size=len(future_cpu))
-    mem_variation = np.std(y_mem) * np.random.uniform(-0.3, 0.3, size=len(future_mem))
+    future_cpu = cpu_line[0] * future_minutes + cpu_line[1]
+    future_mem = mem_line[0] * future_minutes + mem_line[1]
+
+    cpu_variation = cpu_std * np.random.uniform(-0.5, 0.5, size=len(future_cpu))
+    mem_variation = mem_std * np.random.uniform(-0.3, 0.3, size=len(future_mem))
 
     future_cpu = np.clip(future_cpu + cpu_variation, 0, 100)
     future_mem = np.clip(future_mem + mem_variation, 0, 100)
 
-    future_times = generate_future_time_series(total_period_min, interval_min)
-
-    future_data = pd.DataFrame({
-        "Index": range(1, future_intervals + 1),
-        "Time (Unit)": future_times,
+    return make_history(origin + future_minutes * 60, {
         "Predicted CPU Usage": np.round(future_cpu, 2),
         "Predicted Memory Usage": np.round(future_mem, 2),
-    }).set_index("Index")
+    })
+
+def predict_future_trends(past_data, total_period_hours=1, interval_min=5):
+    """Predict future CPU and memory usage using linear regression."""
+    # Regress on real elapsed time so irregularly spaced samples are weighted correctly
+    X = (elapsed_seconds(past_data) / 60).reshape(-1, 1)
+    y_cpu = np.array(past_data["CPU Usage"]).reshape(-1, 1)
+    y_mem = np.array(past_data["Memory Usage"]).reshape(-1, 1)
+
+    model_cpu = LinearRegression().fit(X, y_cpu)
+    model_mem = LinearRegression().fit(X, y_mem)
 
-    return future_data
+    return project_trends(
+        past_data.index[0], X[-1, 0],
+        (model_cpu.coef_[0, 0], model_cpu.intercept_[0]), (model_mem.coef_[0, 0], model_mem.intercept_[0]),
+        np.std(y_cpu), np.std(y_mem), total_period_hours, interval_min,
+    )
 
 def get_metrics_and_predictions(data_source="real-time", csv_path=None, total_period_hours=1, interval_min=5):
     """Unified function to get metrics and predictions based on data source."""
@@ -1,13 +1,15 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from performance import get_past_system_metrics
+from timeseries import elapsed_seconds, format_time_values
 
-def plot_side_by_side_bar_charts():
-    # Get historical data
-    past_data, time_unit = get_past_system_metrics()
+def plot_side_by_side_bar_charts(past_data=None):
+    # Get timestamp-indexed history (e.g. irregularly spaced AdaptiveSampler output) or sample fresh
+    if past_data is None:
+        past_data, _ = get_past_system_metrics()
     
-    # Extract time values
-    time_values = np.array([float(t.split()[0]) for t in past_data["Time (Unit)"]])
+    # Elapsed time in a display unit; nearest-sample selection below copes with uneven spacing
+    time_values, time_unit = format_time_values(elapsed_seconds(past_data))
     total_period = time_values[-1]
     
     # Select 5 time points
@@ -1,24 +1,25 @@
 import subprocess
-import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+from performance import load_user_data_from_csv
+from timeseries import elapsed_seconds
 
 # Step 1: Run the test data generator
 subprocess.run(["python", "generate_test_data.py"], check=True)
 
-# Step 2: Load the generated CSV
-df = pd.read_csv("test_data.csv")
+# Step 2: Load the generated CSV as a timestamp-indexed history
+df = load_user_data_from_csv("test_data.csv")
 
-# Step 3: Convert "Time (Unit)" to numeric minutes
-df["Time"] = df["Time (Unit)"].str.replace(" Min", "").astype(float)
+# Step 3: Minutes since the first sample
+elapsed_min = elapsed_seconds(df) / 60
 
 # Step 4: Define 5 equal time intervals
-total_time = df["Time"].iloc[-1]
+total_time = elapsed_min[-1]
 target_times = np.linspace(total_time / 5, total_time, 5)
 
 # Step 5: Interpolate values at those time points
-cpu_interp = np.interp(target_times, df["Time"], df["CPU Usage"])
-mem_interp = np.interp(target_times, df["Time"], df["Memory Usage"])
+cpu_interp = np.interp(target_times, elapsed_min, df["CPU Usage"])
+mem_interp = np.interp(target_times, elapsed_min, df["Memory Usage"])
 labels = [f"{int(t)} Min" for t in target_times]
 
 # Step 6: Plot two side-by-side graphs
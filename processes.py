@@ -0,0 +1,12 @@
+import psutil
+
+PROCESS_ATTRS = ["pid", "name", "cpu_times", "memory_info"]
+
+def scan_processes():
+    """Read pid, name, CPU times and memory info of every visible process in one pass.
+
+    Returns psutil info dicts; fields a process would not reveal are None.
+    The background trackers share one scan per tick instead of each
+    walking the process table.
+    """
+    return [proc.info for proc in psutil.process_iter(PROCESS_ATTRS)]
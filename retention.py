@@ -0,0 +1,281 @@
+import struct
+import numpy as np
+from performance import load_user_data_from_csv
+from timeseries import make_history, timestamps_of
+
+# File layout: FILE_MAGIC, file header, column descriptors, then blocks of
+# BLOCK_HEADER + per-column (min, max) + bit-packed payload.
+FILE_MAGIC = b"GTSZ"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<BdH")  # version, time precision (s), column count
+COLUMN_HEADER = struct.Struct("<Bb")  # name length, value precision (-1 = raw floats)
+BLOCK_HEADER = struct.Struct("<IIqq")  # payload bytes, sample count, first ts, last ts
+COLUMN_RANGE = struct.Struct("<dd")  # min, max
+
+BLOCK_SIZE = 1024
+DEFAULT_COLUMNS = ("CPU Usage", "Memory Usage")
+DEFAULT_PRECISION = 2  # decimal places kept for values
+MIN_TIME_PRECISION = 0.001  # finest timestamp unit (s)
+TIME_STEP_FRACTION = 0.1  # by default timestamps are kept to a tenth of the typical sampling step
+
+# Delta-of-delta buckets: (control bits, control width, value width)
+DOD_BUCKETS = ((0b10, 2, 7), (0b110, 3, 9), (0b1110, 4, 12))
+MASK64 = (1 << 64) - 1
+
+class _BitWriter:
+    """Append variable-width unsigned values to a byte buffer, MSB first."""
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.acc = 0
+        self.nacc = 0
+
+    def write(self, value, nbits):
+        self.acc = (self.acc << nbits) | value
+        self.nacc += nbits
+        while self.nacc >= 8:
+            self.nacc -= 8
+            self.buf.append((self.acc >> self.nacc) & 0xFF)
+        self.acc &= (1 << self.nacc) - 1
+
+    def getvalue(self):
+        if self.nacc:
+            return bytes(self.buf) + bytes([(self.acc << (8 - self.nacc)) & 0xFF])
+        return bytes(self.buf)
+
+class _BitReader:
+    """Read MSB-first values from one block payload via its binary string form."""
+
+    def __init__(self, payload):
+        self.bits = format(int.from_bytes(payload, "big"), f"0{len(payload) * 8}b") if payload else ""
+        self.pos = 0
+
+    def read(self, nbits):
+        start = self.pos
+        self.pos += nbits
+        return int(self.bits[start:self.pos], 2) if nbits else 0
+
+    def flag(self):
+        self.pos += 1
+        return self.bits[self.pos - 1] == "1"
+
+def _signed(value, nbits):
+    """Sign-extend an nbits two's-complement integer."""
+    return value - (1 << nbits) if value >> (nbits - 1) else value
+
+def _encode_timestamps(writer, ticks):
+    """Gorilla delta-of-delta encoding of integer timestamps."""
+    writer.write(ticks[0] & MASK64, 64)
+    prev_delta = 0
+    for i in range(1, len(ticks)):
+        delta = ticks[i] - ticks[i - 1]
+        dod = delta - prev_delta
+        prev_delta = delta
+        if dod == 0:
+            writer.write(0, 1)
+            continue
+        for control, width, bits in DOD_BUCKETS:
+            if -(1 << (bits - 1)) <= dod < (1 << (bits - 1)):
+                writer.write(control, width)
+                writer.write(dod & ((1 << bits) - 1), bits)
+                break
+        else:
+            writer.write(0b1111, 4)
+            writer.write(dod & MASK64, 64)
+
+def _decode_timestamps(reader, count):
+    ticks = [_signed(reader.read(64), 64)]
+    delta = 0
+    for _ in range(1, count):
+        if reader.flag():
+            if not reader.flag():
+                delta += _signed(reader.read(7), 7)
+            elif not reader.flag():
+                delta += _signed(reader.read(9), 9)
+            elif not reader.flag():
+                delta += _signed(reader.read(12), 12)
+            else:
+                delta += _signed(reader.read(64), 64)
+        ticks.append(ticks[-1] + delta)
+    return ticks
+
+def _encode_values(writer, bits):
+    """Gorilla XOR encoding of float64 bit patterns."""
+    xors = np.bitwise_xor(bits[1:], bits[:-1]).tolist()
+    writer.write(int(bits[0]), 64)
+    prev_lead, prev_trail = 65, 65  # no reusable window yet
+    for xor in xors:
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        lead = min(64 - xor.bit_length(), 31)
+        trail = (xor & -xor).bit_length() - 1
+        if lead >= prev_lead and trail >= prev_trail:
+            writer.write(0b10, 2)
+            writer.write(xor >> prev_trail, 64 - prev_lead - prev_trail)
+        else:
+            meaningful = 64 - lead - trail
+            writer.write(0b11, 2)
+            writer.write(lead, 5)
+            writer.write(meaningful & 63, 6)  # 64 is stored as 0
+            writer.write(xor >> trail, meaningful)
+            prev_lead, prev_trail = lead, trail
+
+def _decode_values(reader, count):
+    value = reader.read(64)
+    values = [value]
+    lead = trail = 0
+    for _ in range(1, count):
+        if reader.flag():
+            if reader.flag():
+                lead = reader.read(5)
+                meaningful = reader.read(6) or 64
+                trail = 64 - lead - meaningful
+            value ^= reader.read(64 - lead - trail) << trail
+        values.append(value)
+    return values
+
+def _quantize(values, precision):
+    """Scale values to integers so XORs of neighbouring samples stay short."""
+    values = np.asarray(values, dtype=np.float64)
+    if precision < 0:
+        return values
+    return np.round(values * 10 ** precision)
+
+def encode_block(ticks, columns, precisions):
+    """Encode one block of integer timestamps and value columns to bytes."""
+    writer = _BitWriter()
+    _encode_timestamps(writer, ticks)
+    ranges = b""
+    for values, precision in zip(columns, precisions):
+        quantized = _quantize(values, precision)
+        _encode_values(writer, quantized.view(np.uint64))
+        finite = values[~np.isnan(values)]
+        low, high = (finite.min(), finite.max()) if finite.size else (np.nan, np.nan)
+        ranges += COLUMN_RANGE.pack(low, high)
+    payload = writer.getvalue()
+    return BLOCK_HEADER.pack(len(payload), len(ticks), ticks[0], ticks[-1]) + ranges + payload
+
+def decode_block(payload, count, precisions):
+    """Decode a block payload into integer timestamps and value arrays."""
+    reader = _BitReader(payload)
+    ticks = _decode_timestamps(reader, count)
+    columns = []
+    for precision in precisions:
+        values = np.array(_decode_values(reader, count), dtype=np.uint64).view(np.float64)
+        columns.append(values / 10 ** precision if precision >= 0 else values)
+    return np.array(ticks, dtype=np.int64), columns
+
+def default_time_precision(timestamps):
+    """Pick the timestamp unit: the power of ten nearest to TIME_STEP_FRACTION of the median step.
+
+    Samples stamped with time.time() jitter by milliseconds; a unit at the
+    sampling resolution absorbs that, so regular steps keep a zero
+    delta-of-delta and cost one bit each.
+    """
+    if len(timestamps) < 2:
+        return MIN_TIME_PRECISION
+    step = float(np.median(np.diff(timestamps)))
+    if step <= 0:
+        return MIN_TIME_PRECISION
+    return max(float(10 ** np.round(np.log10(step * TIME_STEP_FRACTION))), MIN_TIME_PRECISION)
+
+def write_compressed_history(history, path, columns=DEFAULT_COLUMNS, precision=DEFAULT_PRECISION,
+                             time_precision=None, block_size=BLOCK_SIZE):
+    """Write a history DataFrame as Gorilla-compressed blocks and return bytes written.
+
+    history is a timestamp-indexed frame. precision is the number of
+    decimals kept (an int, or a dict per column); use -1 to store raw
+    float64 values. time_precision is the timestamp unit in seconds
+    (default: default_time_precision of the history).
+    """
+    if time_precision is None:
+        time_precision = default_time_precision(timestamps_of(history))
+    ticks = np.round(timestamps_of(history) / time_precision).astype(np.int64)
+    precisions = [precision.get(c, DEFAULT_PRECISION) if isinstance(precision, dict) else precision
+                  for c in columns]
+    data = [history[c].to_numpy(dtype=float) for c in columns]
+
+    with open(path, "wb") as f:
+        f.write(FILE_MAGIC + FILE_HEADER.pack(FILE_VERSION, time_precision, len(columns)))
+        for name, p in zip(columns, precisions):
+            encoded = name.encode("utf-8")
+            f.write(COLUMN_HEADER.pack(len(encoded), p) + encoded)
+        for start in range(0, len(ticks), block_size):
+            stop = start + block_size
+            f.write(encode_block(ticks[start:stop].tolist(), [d[start:stop] for d in data], precisions))
+        return f.tell()
+
+def _read_file_header(f):
+    if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+        raise ValueError("Not a compressed history file")
+    version, time_precision, ncols = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+    if version != FILE_VERSION:
+        raise ValueError(f"Unsupported compressed history version: {version}")
+    names, precisions = [], []
+    for _ in range(ncols):
+        length, p = COLUMN_HEADER.unpack(f.read(COLUMN_HEADER.size))
+        names.append(f.read(length).decode("utf-8"))
+        precisions.append(p)
+    return time_precision, names, precisions
+
+def read_compressed_history(path, start=None, end=None, where=None):
+    """Load compressed history, decoding only blocks that can match the query.
+
+    start/end are timestamps in seconds (inclusive). where maps a column to
+    a (low, high) bound, either side None; blocks whose header min/max fall
+    outside every bound are skipped without decoding.
+    """
+    where = where or {}
+    timestamps, values = [], []
+    with open(path, "rb") as f:
+        time_precision, names, precisions = _read_file_header(f)
+        start_tick = None if start is None else int(np.floor(start / time_precision))
+        end_tick = None if end is None else int(np.ceil(end / time_precision))
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                break
+            length, count, first, last = BLOCK_HEADER.unpack(header)
+            ranges = [COLUMN_RANGE.unpack(f.read(COLUMN_RANGE.size)) for _ in names]
+            skip = (start_tick is not None and last < start_tick) or (end_tick is not None and first > end_tick)
+            for name, (low, high) in where.items():
+                col_min, col_max = ranges[names.index(name)]
+                if (low is not None and col_max < low) or (high is not None and col_min > high):
+                    skip = True
+            if skip:
+                f.seek(length, 1)
+                continue
+            ticks, columns = decode_block(f.read(length), count, precisions)
+            timestamps.append(ticks)
+            values.append(columns)
+
+    if not timestamps:
+        return make_history([], {name: [] for name in names})
+    ticks = np.concatenate(timestamps)
+    data = {name: np.concatenate([block[i] for block in values]) for i, name in enumerate(names)}
+
+    mask = np.ones(len(ticks), dtype=bool)
+    if start_tick is not None:
+        mask &= ticks >= start_tick
+    if end_tick is not None:
+        mask &= ticks <= end_tick
+    for name, (low, high) in where.items():
+        if low is not None:
+            mask &= data[name] >= low
+        if high is not None:
+            mask &= data[name] <= high
+    return make_history(ticks[mask] * time_precision, {name: column[mask] for name, column in data.items()})
+
+def compress_csv(csv_path, out_path, **kwargs):
+    """Convert a save_to_csv history file to the compressed format."""
+    return write_compressed_history(load_user_data_from_csv(csv_path), out_path, **kwargs)
+
+if __name__ == "__main__":
+    import os
+    import sys
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "test_data.csv"
+    out_path = os.path.splitext(csv_path)[0] + ".gtsz"
+    size = compress_csv(csv_path, out_path)
+    history = read_compressed_history(out_path)
+    print(f"Compressed {len(history)} samples into {size} bytes ({size / max(len(history), 1):.2f} bytes/sample)")
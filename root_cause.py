@@ -0,0 +1,250 @@
+import time
+import numpy as np
+import pandas as pd
+import psutil
+from processes import scan_processes
+from cpu_cores import read_core_times, core_percentages, core_metrics, mean_busy
+from timeseries import make_history, timestamps_of
+
+# Defaults
+MAX_LAG_SAMPLES = 3
+SPIKE_Z = 1.5  # system samples this many std devs above the mean count as spikes
+CHUNK_SIZE = 1024  # processes analysed per block to bound temporary memory
+TOP_CULPRITS = 5
+MIN_CORRELATION = 0.3
+BYTES_PER_MB = 1024 * 1024
+WINDOW_SAMPLES = 360  # one hour at the GUI's 10 s tick
+INITIAL_ROWS = 512
+
+class ProcessSeriesCollector:
+    """Keep a rolling window of aligned system and per-process CPU/RSS samples.
+
+    Samples go into fixed processes x window ring buffers, overwriting the
+    oldest column. A process's row is recycled once it has not been seen
+    for a whole window, so memory is bounded by the processes alive within
+    the window times its length, however long the collector runs.
+    """
+
+    def __init__(self, window=WINDOW_SAMPLES):
+        self.window = window
+        self.count = 0  # samples taken so far
+        self.rows = {}  # (pid, name) -> row index
+        self.free = list(range(INITIAL_ROWS - 1, -1, -1))
+        self.pids = np.zeros(INITIAL_ROWS, dtype=np.int64)
+        self.names = np.empty(INITIAL_ROWS, dtype=object)
+        self.last_seen = np.zeros(INITIAL_ROWS, dtype=np.int64)
+        self.cpu = np.full((INITIAL_ROWS, window), np.nan, dtype=np.float32)
+        self.rss = np.full((INITIAL_ROWS, window), np.nan, dtype=np.float32)
+        self.timestamps = np.zeros(window)
+        self.system_cpu = np.zeros(window)
+        self.system_mem = np.zeros(window)
+        self._prev_cores = read_core_times()
+        self._prev_cpu_times = self._read_cpu_times()
+        self._prev_time = time.monotonic()
+
+    @staticmethod
+    def _read_cpu_times():
+        """Return {(pid, name): user + system seconds} for every visible process."""
+        times = {}
+        for info in scan_processes():
+            if info["cpu_times"] is not None:
+                times[(info["pid"], info["name"])] = info["cpu_times"].user + info["cpu_times"].system
+        return times
+
+    def _allocate(self, key):
+        """Return an empty row for a newly seen process, doubling the buffers when full."""
+        if not self.free:
+            size = len(self.pids)
+            self.pids = np.concatenate([self.pids, np.zeros(size, dtype=np.int64)])
+            self.names = np.concatenate([self.names, np.empty(size, dtype=object)])
+            self.last_seen = np.concatenate([self.last_seen, np.zeros(size, dtype=np.int64)])
+            self.cpu, self.rss = (np.vstack([m, np.full((size, self.window), np.nan, dtype=np.float32)])
+                                  for m in (self.cpu, self.rss))
+            self.free.extend(range(2 * size - 1, size - 1, -1))
+        row = self.free.pop()
+        self.rows[key] = row
+        self.pids[row], self.names[row] = key
+        return row
+
+    def _expire(self):
+        """Recycle rows of processes that have no reading left in the window."""
+        for key in [key for key, row in self.rows.items() if self.count - self.last_seen[row] >= self.window]:
+            row = self.rows.pop(key)
+            self.names[row] = None
+            self.free.append(row)
+
+    def sample(self, processes=None):
+        """Record one aligned sample of the system and every process (a scan_processes() result, or a fresh one)."""
+        now = time.monotonic()
+        elapsed = max(now - self._prev_time, 1e-6)
+        cores = read_core_times()
+        _, core_pct = core_percentages(self._prev_cores, cores)
+        system_cpu = mean_busy(core_metrics(core_pct))  # NaN if the last sample was too recent
+        self._prev_cores, self._prev_time = cores, now
+
+        column = self.count % self.window
+        self.cpu[:, column] = np.nan
+        self.rss[:, column] = np.nan
+        cpu_times = {}
+        for info in scan_processes() if processes is None else processes:
+            if info["cpu_times"] is None or info["memory_info"] is None:
+                continue
+            key = (info["pid"], info["name"])  # guards against pid reuse
+            row = self.rows.get(key)
+            if row is None:
+                row = self._allocate(key)
+            total = info["cpu_times"].user + info["cpu_times"].system
+            cpu_times[key] = total
+            prev = self._prev_cpu_times.get(key)
+            if prev is not None:  # a process seen for the first time has no rate yet
+                self.cpu[row, column] = (total - prev) / elapsed * 100
+            self.rss[row, column] = info["memory_info"].rss
+            self.last_seen[row] = self.count
+        self._prev_cpu_times = cpu_times
+
+        self.timestamps[column] = time.time()
+        self.system_cpu[column] = round(system_cpu, 1)
+        self.system_mem[column] = psutil.virtual_memory().percent
+        self.count += 1
+        self._expire()
+
+    def collect(self, samples=8, interval=0.5):
+        """Take `samples` samples `interval` seconds apart."""
+        for _ in range(samples):
+            time.sleep(interval)
+            self.sample()
+        return self.series()
+
+    def series(self):
+        """Return (system history, pids, names, cpu matrix, rss matrix) for the window, oldest first.
+
+        Matrices are processes x time. Cells without a reading (process not
+        yet seen or already gone) are NaN.
+        """
+        n_time = min(self.count, self.window)
+        order = (np.arange(n_time) + self.count - n_time) % self.window
+        rows = np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+        system = make_history(self.timestamps[order], {"CPU Usage": self.system_cpu[order],
+                                                       "Memory Usage": self.system_mem[order]})
+        return system, self.pids[rows], self.names[rows], self.cpu[np.ix_(rows, order)], self.rss[np.ix_(rows, order)]
+
+def _masked_mean(matrix, columns):
+    """Row means over the selected columns, ignoring NaNs (NaN where a row has none)."""
+    block = matrix[:, columns]
+    valid = ~np.isnan(block)
+    n = valid.sum(axis=1)
+    return np.where(n > 0, np.where(valid, block, 0).sum(axis=1) / np.maximum(n, 1), np.nan)
+
+def _shift_mask(mask, lag):
+    """Process columns that pair with the masked system columns when the process leads by lag samples."""
+    shifted = np.zeros_like(mask)
+    shifted[:len(mask) - lag] = mask[lag:]
+    return shifted
+
+def _masked_correlation(matrix, series):
+    """Pearson correlation of every row with series over cells where both have a reading.
+
+    Rows with fewer than three readings or no variance get 0.
+    """
+    valid = ~np.isnan(matrix) & ~np.isnan(series)[np.newaxis, :]
+    n = valid.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    x = np.where(valid, matrix, 0)
+    y = np.where(valid, series[np.newaxis, :], 0)
+    dx = np.where(valid, x - (x.sum(axis=1) / safe_n)[:, None], 0)
+    dy = np.where(valid, y - (y.sum(axis=1) / safe_n)[:, None], 0)
+    denom = np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+    ok = (n >= 3) & (denom > 0)
+    return np.where(ok, (dx * dy).sum(axis=1) / np.where(ok, denom, 1), 0).astype(np.float32)
+
+def lagged_correlation(process_matrix, system, max_lag=MAX_LAG_SAMPLES):
+    """Best Pearson correlation of every process row with the system series.
+
+    A lag of k means the process leads the system by k samples. NaN cells
+    are left out of each row's correlation. Returns (best correlation, best
+    lag) arrays, one entry per process.
+    """
+    n_proc, n_time = process_matrix.shape
+    best_corr = np.full(n_proc, -np.inf, dtype=np.float32)
+    best_lag = np.zeros(n_proc, dtype=np.int64)
+    for lag in range(0, min(max_lag, n_time - 2) + 1):
+        corr = _masked_correlation(process_matrix[:, :n_time - lag], system[lag:])
+        better = corr > best_corr
+        best_corr[better] = corr[better]
+        best_lag[better] = lag
+    return best_corr, best_lag
+
+def rank_root_causes(system, pids, names, cpu, rss, n_cpus=None, max_lag=MAX_LAG_SAMPLES,
+                     top=TOP_CULPRITS, chunk_size=CHUNK_SIZE):
+    """Rank processes by how well they explain system CPU spikes.
+
+    system is a timestamp-indexed history with "CPU Usage" (and optionally
+    "Memory Usage"); cpu and rss are processes x time matrices aligned with
+    it, where process CPU % is relative to one core and NaN marks samples
+    without a reading (in either the system or a process series). Processes are scored in chunks so temporaries stay
+    bounded at chunk_size x time.
+    """
+    n_cpus = n_cpus or psutil.cpu_count() or 1
+    sys_cpu = system["CPU Usage"].to_numpy(dtype=np.float32)
+    sys_mem = system["Memory Usage"].to_numpy(dtype=np.float32) if "Memory Usage" in system else None
+    columns = ["PID", "Name", "Score", "CPU Corr", "Lag (s)", "Spike CPU Share (%)", "RSS Corr", "RSS Growth (MB)"]
+    known = ~np.isnan(sys_cpu)
+    if len(pids) == 0 or known.sum() < 3:
+        return pd.DataFrame(columns=columns)
+
+    level = sys_cpu[known]
+    spikes = known & (np.where(known, sys_cpu, -np.inf) > level.mean() + SPIKE_Z * level.std())
+    if not spikes.any():
+        spikes = known & (sys_cpu >= level.max())
+    baseline = known & ~spikes if (known & ~spikes).any() else spikes
+    spike_excess = max(float(sys_cpu[spikes].mean() - sys_cpu[baseline].mean()), 1e-6)
+    step = float(np.median(np.diff(timestamps_of(system)))) if len(system) > 1 else 0.0
+
+    frames = []
+    for start in range(0, len(pids), chunk_size):
+        stop = start + chunk_size
+        cpu_chunk = cpu[start:stop]
+        rss_chunk = rss[start:stop]
+
+        corr, lag = lagged_correlation(cpu_chunk, sys_cpu, max_lag)
+        # Excess process CPU during spikes as a share of the system's excess (system % spans all cores),
+        # read at each process's own lag so a process that leads the spike is credited for it
+        excess = np.empty(len(corr))
+        for k in np.unique(lag):
+            group = lag == k
+            rows = cpu_chunk[group]
+            during = _masked_mean(rows, _shift_mask(spikes, k))
+            excess[group] = (during - _masked_mean(rows, _shift_mask(baseline, k))) / n_cpus
+        share = np.clip(np.nan_to_num(excess / spike_excess * 100, nan=0.0), 0, 100)
+        if sys_mem is not None:
+            rss_corr, _ = lagged_correlation(rss_chunk, sys_mem, 0)
+        else:
+            rss_corr = np.zeros(len(corr), dtype=np.float32)
+        # Processes that started or exited inside the window report no growth
+        growth = np.nan_to_num((rss[start:stop, -1] - rss[start:stop, 0]) / BYTES_PER_MB, nan=0.0)
+
+        corr, share, rss_corr, growth = (a.astype(np.float64) for a in (corr, share, rss_corr, growth))
+        frames.append(pd.DataFrame({
+            "PID": pids[start:stop],
+            "Name": names[start:stop],
+            "Score": np.round(np.clip(corr, 0, 1) * share, 2),
+            "CPU Corr": np.round(corr, 3),
+            "Lag (s)": np.round(lag * step, 2),
+            "Spike CPU Share (%)": np.round(share, 1),
+            "RSS Corr": np.round(rss_corr, 3),
+            "RSS Growth (MB)": np.round(growth, 1),
+        }))
+    ranked = pd.concat(frames, ignore_index=True)
+    ranked = ranked[ranked["CPU Corr"] >= MIN_CORRELATION]
+    return ranked.nlargest(top, "Score").reset_index(drop=True)
+
+def format_culprits(ranked):
+    """Render ranked culprits as bottleneck report lines."""
+    lines = []
+    for rank, row in enumerate(ranked.to_dict("records"), start=1):
+        if row["Score"] <= 0:
+            continue
+        lines.append(f"🔎 Culprit #{rank}: {row['Name']} (PID {row['PID']}) drove {row['Spike CPU Share (%)']}% "
+                     f"of the CPU spike (corr {row['CPU Corr']}, leads by {row['Lag (s)']} s, "
+                     f"RSS {row['RSS Growth (MB)']:+} MB)")
+    return lines
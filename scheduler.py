@@ -0,0 +1,128 @@
+import time
+from performance import read_system_counters, metrics_between, get_nic_speeds
+from timeseries import make_history, resample, with_time_labels
+from bottlenecks import CPU_HIGH, MEMORY_HIGH, DISK_UTIL_HIGH, NET_UTIL_HIGH
+
+# Defaults
+MIN_INTERVAL = 0.25  # seconds
+MAX_INTERVAL = 30.0  # seconds
+BASE_INTERVAL = 1.0  # seconds
+BACKOFF_FACTOR = 2.0
+SPEEDUP_FACTOR = 4.0
+VOLATILITY_THRESHOLD = 5.0  # percentage points between consecutive samples
+CPU_BUDGET = 0.01  # fraction of one core the monitor may use
+QUIET_SAMPLES_BEFORE_BACKOFF = 3
+
+def default_alert(sample):
+    """Return True when a sample crosses any bottleneck threshold."""
+    return (sample["CPU Usage"] > CPU_HIGH or sample["Memory Usage"] > MEMORY_HIGH
+            or sample["Disk Util (%)"] > DISK_UTIL_HIGH or sample["Net Util (%)"] > NET_UTIL_HIGH)
+
+class AdaptiveSampler:
+    """Drives metrics_between at a variable rate, trading resolution for overhead.
+
+    The interval drops towards min_interval when consecutive samples move by
+    more than volatility_threshold points or alert_fn fires, and doubles
+    (up to max_interval) after a run of quiet samples. Regardless of either,
+    the interval never falls below the one that keeps the sampler's own CPU
+    time under cpu_budget.
+    """
+
+    def __init__(self, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, base_interval=BASE_INTERVAL,
+                 cpu_budget=CPU_BUDGET, volatility_threshold=VOLATILITY_THRESHOLD, alert_fn=default_alert):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = base_interval
+        self.cpu_budget = cpu_budget
+        self.volatility_threshold = volatility_threshold
+        self.alert_fn = alert_fn
+        self.nic_speeds = get_nic_speeds()
+        self.samples = []
+        self.sample_cost = 0.0  # EWMA of CPU seconds spent per sample
+        self.quiet_streak = 0
+        self.monitor_cpu = 0.0
+        self._prev_counters = None
+        self._prev_sample = None
+
+    def sample_once(self):
+        """Take one sample since the previous call and adapt the next interval."""
+        cpu_start = time.thread_time()
+        counters = read_system_counters()
+        timestamp = time.time()
+        if self._prev_counters is None:
+            self._prev_counters = counters
+            return None
+        sample, _, _, _ = metrics_between(self._prev_counters, counters, self.nic_speeds)
+        self._prev_counters = counters
+
+        sample = {"Timestamp": timestamp, "Interval (s)": round(self.interval, 3), **sample}
+        self.samples.append(sample)
+        self.interval = self.next_interval(sample)
+        self._prev_sample = sample
+
+        cost = time.thread_time() - cpu_start
+        self.monitor_cpu += cost
+        self.sample_cost = cost if self.sample_cost == 0 else 0.8 * self.sample_cost + 0.2 * cost
+        return sample
+
+    def next_interval(self, sample):
+        """Pick the next sampling interval from volatility, alerts and the CPU budget."""
+        change = 0.0
+        if self._prev_sample is not None:
+            change = max(abs(sample["CPU Usage"] - self._prev_sample["CPU Usage"]),
+                         abs(sample["Memory Usage"] - self._prev_sample["Memory Usage"]))
+
+        if self.alert_fn is not None and self.alert_fn(sample):
+            interval = self.min_interval
+            self.quiet_streak = 0
+        elif change > self.volatility_threshold:
+            interval = self.interval / SPEEDUP_FACTOR
+            self.quiet_streak = 0
+        else:
+            self.quiet_streak += 1
+            interval = self.interval
+            if self.quiet_streak >= QUIET_SAMPLES_BEFORE_BACKOFF:
+                interval = self.interval * BACKOFF_FACTOR
+
+        budget_floor = self.sample_cost / self.cpu_budget if self.cpu_budget else 0.0
+        return min(max(interval, self.min_interval, budget_floor), self.max_interval)
+
+    def run(self, duration=None, max_samples=None, callback=None):
+        """Sample until duration seconds pass or max_samples are collected."""
+        start = time.monotonic()
+        self.sample_once()
+        while True:
+            if duration is not None and time.monotonic() - start >= duration:
+                break
+            if max_samples is not None and len(self.samples) >= max_samples:
+                break
+            time.sleep(self.interval)
+            sample = self.sample_once()
+            if callback is not None and sample is not None:
+                callback(sample)
+        return self.to_dataframe()
+
+    def overhead(self):
+        """Return the fraction of one core the sampler has used since its first sample."""
+        if len(self.samples) < 2:
+            return 0.0
+        span = self.samples[-1]["Timestamp"] - self.samples[0]["Timestamp"]
+        return self.monitor_cpu / span if span > 0 else 0.0
+
+    def to_dataframe(self, step=None):
+        """Return collected samples as a timestamp-indexed history frame.
+
+        Samples arrive at a varying interval; pass step (seconds) to average
+        them onto a fixed grid for plotting or fitting.
+        """
+        samples = [dict(s) for s in self.samples]
+        timestamps = [s.pop("Timestamp") for s in samples]
+        history = make_history(timestamps, samples)
+        return history if step is None else resample(history, step)
+
+if __name__ == "__main__":
+    sampler = AdaptiveSampler()
+    sampler.run(duration=30)
+    history = sampler.to_dataframe(step=BASE_INTERVAL * 5)
+    print(with_time_labels(history)[["Time (Unit)", "Interval (s)", "CPU Usage", "Memory Usage"]].to_string())
+    print(f"\nMonitor overhead: {sampler.overhead() * 100:.3f}% of one core")
@@ -0,0 +1,44 @@
+import numpy as np
+from cpu_cores import (CORE_FIELDS, CoreHistory, core_metrics, core_percentages, detect_core_history_issues,
+                       detect_core_issues, mean_busy)
+
+IDS = np.arange(4)
+
+def snapshot(user, idle=1.0):
+    """Cumulative per-core times with the given seconds of user and idle time."""
+    times = np.zeros((len(IDS), len(CORE_FIELDS)))
+    times[:, CORE_FIELDS.index("user")] = user
+    times[:, CORE_FIELDS.index("idle")] = idle
+    return IDS, times
+
+def test_identical_snapshots_are_unknown_not_busy():
+    _, percentages = core_percentages(snapshot(5.0), snapshot(5.0))
+    metrics = core_metrics(percentages)
+    assert np.isnan(metrics).all()
+    assert np.isnan(mean_busy(metrics))
+    assert detect_core_issues(IDS, metrics) == []
+
+def test_one_tick_is_not_enough():
+    _, percentages = core_percentages(snapshot(5.0), snapshot(5.01))
+    assert np.isnan(percentages).all()
+
+def test_busy_cores_are_measured():
+    _, percentages = core_percentages(snapshot(5.0), snapshot(6.0))
+    metrics = core_metrics(percentages)
+    np.testing.assert_allclose(metrics[:, 0], 100)
+    assert mean_busy(metrics) == 100
+
+def test_history_skips_unmeasured_samples():
+    history = CoreHistory(IDS, capacity=10)
+    for _ in range(5):
+        history.sample(snapshot(5.0), snapshot(5.0))
+        history.sample(snapshot(5.0), snapshot(5.2, 1.8))  # 20% busy
+    assert detect_core_history_issues(history) == []
+    history.sample(snapshot(5.0), snapshot(5.0))
+    assert history.count == 11
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"ok  {name}")
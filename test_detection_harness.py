@@ -0,0 +1,37 @@
+import pandas as pd
+from bottlenecks import detect_io_bottlenecks
+from optimizations import suggest_io_optimizations
+from detection_harness import alert_kinds, score_run
+
+DISK_COLUMNS = ["Device", "Util (%)", "Await (ms)", "Read IOPS", "Write IOPS"]
+NET_COLUMNS = ["Interface", "Util (%)", "Packets In/s", "Packets Out/s", "Errors/s", "Drops/s"]
+
+def io_lines(util):
+    disks = pd.DataFrame([["sda", util, 5.0, 100.0, 100.0]], columns=DISK_COLUMNS)
+    nics = pd.DataFrame(columns=NET_COLUMNS)
+    return detect_io_bottlenecks(disks, nics) + suggest_io_optimizations(disks, nics)
+
+def test_disk_capacity_lines_are_not_io_alerts():
+    lines = ["🔴 Disk space almost full. Clean up files or extend storage.",
+             "🟠 Disk space usage high. Consider cleaning temporary files."]
+    assert alert_kinds(lines) == set()
+    assert alert_kinds(lines, severe_only=False) == set()
+
+def test_disk_saturation_lines_are_io_alerts():
+    assert alert_kinds(io_lines(95)) == {"io"}
+    assert alert_kinds(io_lines(60)) == set()
+    assert alert_kinds(io_lines(60), severe_only=False) == {"io"}
+    assert alert_kinds(io_lines(10), severe_only=False) == set()
+
+def test_quiet_alerts_count_as_false_positives():
+    events = [{"Kind": "io", "Start": 10.0, "End": 20.0}]
+    ticks = [{"Time": float(t), "Alerts": ["io"] if t in (3, 12) else [], "Warnings": []} for t in range(1, 31)]
+    latencies, summary = score_run(events, ticks)
+    assert latencies["Latency (s)"].iloc[0] == 2.0
+    assert summary["False Positives (io)"] == 1
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"ok  {name}")
@@ -0,0 +1,84 @@
+import numpy as np
+from leaks import LeakDetector, BYTES_PER_MB, MIN_SAMPLES, SHIFT_RUN
+
+TICK = 10  # seconds between samples, as in the GUI
+START = 1e9
+
+def run(series, ticks=720, tick=TICK, detector=None):
+    """Feed processes x ticks RSS values (MB) into a detector; return it and each pid's first flagged tick."""
+    detector = detector or LeakDetector()
+    pids = np.arange(1, series.shape[0] + 1)
+    names = [f"proc{pid}" for pid in pids]
+    first = {}
+    for i in range(ticks):
+        detector.update(pids, names, series[:, i] * BYTES_PER_MB, START + i * tick)
+        for pid in detector.leaks()["PID"]:
+            first.setdefault(int(pid), i)
+    return detector, first
+
+def hours(ticks=720, tick=TICK):
+    return np.arange(ticks) * tick / 3600
+
+def test_linear_leaks_are_found_with_their_rate():
+    rng = np.random.default_rng(0)
+    rates = np.linspace(2, 100, 20)  # MB/h
+    series = 300 + rates[:, None] * hours() + rng.normal(0, 0.5, (20, 720))
+    detector, first = run(series)
+    assert sorted(first) == list(range(1, 21))
+    leaks = detector.leaks().sort_values("PID")
+    np.testing.assert_allclose(leaks["Leak Rate (MB/h)"], rates, rtol=0.1)
+
+def test_gc_sawtooth_is_not_a_leak():
+    # Grows 60 MB over 5 min, then the collector frees it all
+    ticks = np.arange(720)
+    series = np.vstack([400 + (ticks % period) * 60 / period for period in (6, 30, 60, 90)])
+    _, first = run(series)
+    assert first == {}
+
+def test_isolated_spikes_are_ignored():
+    rng = np.random.default_rng(1)
+    series = 250 + rng.normal(0, 1, (10, 720))
+    spikes = rng.random((10, 720)) < 0.03
+    series[spikes] += rng.uniform(100, 500, spikes.sum())
+    _, first = run(series)
+    assert first == {}
+
+def test_spikes_do_not_hide_a_leak():
+    rng = np.random.default_rng(2)
+    series = (200 + 20 * hours() + rng.normal(0, 0.5, 720))[None, :]
+    series[0, 7::50] += 300
+    detector, first = run(series)
+    assert 1 in first
+    assert abs(detector.leaks()["Leak Rate (MB/h)"].iloc[0] - 20) < 2
+
+def test_one_off_step_is_not_a_leak():
+    rng = np.random.default_rng(3)
+    series = 100 + rng.normal(0, 0.2, (3, 720))
+    for row, (at, size) in enumerate(((100, 150), (300, 40), (500, 400))):
+        series[row, at:] += size
+    _, first = run(series)
+    assert first == {}
+
+def test_young_process_with_fast_ramp_is_found():
+    # A fresh process idles for a few seconds, then ramps 50 MB/s from 10 MB (compressed window, 1 s ticks)
+    for idle in (0, 2, 5):
+        series = np.concatenate([np.full(idle, 10.0), 10 + 50 * np.arange(1, 31 - idle)])[None, :]
+        detector = LeakDetector(half_life_seconds=30, sustained_seconds=5)
+        _, first = run(series, ticks=30, tick=1, detector=detector)
+        # After an idle start the ramp looks like a level shift first, so allow that restart on top of
+        # the MIN_SAMPLES warm-up and the sustained time
+        assert 1 in first and first[1] <= idle + SHIFT_RUN + MIN_SAMPLES + 5 + 1
+
+def test_exited_processes_release_their_state():
+    detector = LeakDetector()
+    for i in range(2000):
+        detector.update([1, 1000 + i], ["svc", "short-lived"], [200 * BYTES_PER_MB, 10 * BYTES_PER_MB],
+                        START + i * TICK)
+    assert len(detector.slots) == 2
+    assert len(detector.pids) == 256
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"ok  {name}")
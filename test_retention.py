@@ -0,0 +1,86 @@
+import os
+import tempfile
+import numpy as np
+import retention
+from retention import (BLOCK_HEADER, COLUMN_RANGE, decode_block, default_time_precision, encode_block,
+                       read_compressed_history, write_compressed_history)
+from timeseries import make_history, timestamps_of
+
+START = 1.7e9
+
+def roundtrip(ticks, columns, precisions):
+    """Encode one block and decode it from its payload."""
+    block = encode_block(ticks, columns, precisions)
+    length, count, first, last = BLOCK_HEADER.unpack(block[:BLOCK_HEADER.size])
+    payload = block[BLOCK_HEADER.size + COLUMN_RANGE.size * len(columns):]
+    assert (length, count, first, last) == (len(payload), len(ticks), ticks[0], ticks[-1])
+    return decode_block(payload, count, precisions)
+
+def test_block_roundtrip():
+    rng = np.random.default_rng(0)
+    # Regular steps, jitter, a long gap and a step back exercise every delta-of-delta bucket
+    ticks = (np.cumsum(rng.choice([1000, 1000, 1000, 997, 1060, 5000, 10 ** 9, -3], 500)) + 17 * 10 ** 11).tolist()
+    cpu = np.round(rng.uniform(0, 100, 500), 2)
+    mem = np.round(50 + np.cumsum(rng.normal(0, 0.1, 500)), 2)
+    decoded_ticks, (cpu_back, mem_back) = roundtrip(ticks, [cpu, mem], [2, 2])
+    assert decoded_ticks.tolist() == ticks
+    np.testing.assert_allclose(cpu_back, cpu, atol=1e-9)
+    np.testing.assert_allclose(mem_back, mem, atol=1e-9)
+
+def test_nan_and_raw_floats_roundtrip():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 1e6, 200)
+    values[[0, 5, 6, 199]] = np.nan
+    _, (quantized, raw) = roundtrip(list(range(200)), [values, values], [2, -1])
+    assert np.array_equal(np.isnan(quantized), np.isnan(values))
+    np.testing.assert_allclose(quantized, np.round(values, 2), atol=1e-6)
+    assert np.array_equal(raw, values, equal_nan=True)  # -1 keeps float64 bits exactly
+
+def test_single_sample_block():
+    ticks, (values,) = roundtrip([-5], [np.array([42.5])], [1])
+    assert ticks.tolist() == [-5]
+    assert values.tolist() == [42.5]
+
+def test_default_time_precision_absorbs_jitter():
+    rng = np.random.default_rng(2)
+    timestamps = START + np.arange(1000) + rng.normal(0, 0.002, 1000)
+    assert default_time_precision(timestamps) == 0.1
+    assert default_time_precision(START + np.arange(1000) * 0.9999) == 0.1
+    assert default_time_precision(START + 10 * np.arange(100)) == 1.0
+    assert default_time_precision(np.array([START])) == retention.MIN_TIME_PRECISION
+
+def test_file_roundtrip_and_block_skipping():
+    n = 5000
+    timestamps = START + np.arange(n) + np.random.default_rng(3).normal(0, 0.002, n)
+    cpu = np.where(np.arange(n) // 1000 == 2, 95.0, 10.0)  # only the third block runs hot
+    history = make_history(timestamps, {"CPU Usage": cpu, "Memory Usage": np.linspace(20, 80, n)})
+    decoded = []
+    original = retention.decode_block
+
+    def counting_decode(payload, count, precisions):
+        decoded.append(count)
+        return original(payload, count, precisions)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "history.gtsz")
+        write_compressed_history(history, path, block_size=1000)
+        everything = read_compressed_history(path)
+        assert len(everything) == n
+        assert np.abs(timestamps_of(everything) - timestamps).max() < 0.05
+        np.testing.assert_allclose(everything["Memory Usage"], np.round(history["Memory Usage"], 2))
+
+        retention.decode_block = counting_decode
+        try:
+            hot = read_compressed_history(path, where={"CPU Usage": (90, None)})
+            assert len(decoded) == 1 and len(hot) == 1000
+            decoded.clear()
+            window = read_compressed_history(path, start=START + 3500, end=START + 3600)
+            assert len(decoded) == 1 and len(window) in (100, 101)
+        finally:
+            retention.decode_block = original
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"ok  {name}")
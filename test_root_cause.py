@@ -0,0 +1,61 @@
+import numpy as np
+from timeseries import make_history
+from root_cause import rank_root_causes, format_culprits
+
+N_PROC = 50
+N_TIME = 600
+N_CPUS = 4
+TICK = 10  # seconds between samples, as in the GUI
+START = 1e9
+
+def workload(lag=0, seed=0):
+    """System CPU with periodic spikes, all driven by process 7 leading them by `lag` samples."""
+    rng = np.random.default_rng(seed)
+    cpu = rng.uniform(0, 2, (N_PROC, N_TIME))
+    rss = np.full((N_PROC, N_TIME), 100.0 * 1024 ** 2)
+    burst = np.zeros(N_TIME)
+    for at in range(20, N_TIME - 10, 60):
+        burst[at:at + 5] = 300  # three cores' worth of CPU for five samples
+    cpu[7] += burst
+    # System CPU spans all cores and responds `lag` samples after the process
+    sys_cpu = 10 + rng.normal(0, 0.5, N_TIME) + np.roll(burst, lag) / N_CPUS
+    system = make_history(START + np.arange(N_TIME) * TICK, {"CPU Usage": sys_cpu})
+    return system, np.arange(1, N_PROC + 1), np.array([f"proc{i}" for i in range(N_PROC)], dtype=object), cpu, rss
+
+def test_spike_owner_is_top_culprit():
+    ranked = rank_root_causes(*workload(), n_cpus=N_CPUS)
+    top = ranked.iloc[0]
+    assert top["PID"] == 8
+    assert top["Lag (s)"] == 0
+    assert top["Spike CPU Share (%)"] > 90
+
+def test_leading_process_keeps_its_share():
+    for lag in (1, 2, 3):
+        ranked = rank_root_causes(*workload(lag), n_cpus=N_CPUS)
+        top = ranked.iloc[0]
+        assert top["PID"] == 8
+        assert top["Lag (s)"] == lag * TICK
+        assert top["Spike CPU Share (%)"] > 90
+        assert top["Score"] > 80
+        assert f"drove {top['Spike CPU Share (%)']}%" in format_culprits(ranked)[0]
+
+def test_missing_readings_are_not_spikes():
+    system, pids, names, cpu, rss = workload()
+    # A process first seen half-way through the window has no earlier readings
+    cpu[3, :300] = np.nan
+    ranked = rank_root_causes(system, pids, names, cpu, rss, n_cpus=N_CPUS)
+    assert 4 not in set(ranked.loc[ranked["Score"] > 1, "PID"])
+
+def test_unmeasured_system_samples_are_skipped():
+    system, pids, names, cpu, rss = workload()
+    # The first system sample is NaN when it came too soon after the previous one
+    system.iloc[0, 0] = np.nan
+    ranked = rank_root_causes(system, pids, names, cpu, rss, n_cpus=N_CPUS)
+    assert ranked.iloc[0]["PID"] == 8
+    assert ranked.iloc[0]["Spike CPU Share (%)"] > 90
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"ok  {name}")
@@ -0,0 +1,147 @@
+import os
+import time
+import pandas as pd
+import psutil
+
+PROC_ROOT = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+TOP_THREADS = 15
+MAX_CACHED_FDS = 4096
+THREAD_STATES = {
+    "R": "running", "S": "sleeping", "D": "disk-sleep", "T": "stopped", "t": "tracing-stop",
+    "Z": "zombie", "X": "dead", "I": "idle", "W": "paging", "P": "parked",
+}
+
+def _parse_stat(data):
+    """Return (comm, state, utime + stime ticks) from the contents of a /proc stat file."""
+    # comm may contain spaces or parentheses, so split on the last ')'
+    close = data.rfind(b")")
+    fields = data[close + 2:].split()
+    return data[data.find(b"(") + 1:close], fields[0], int(fields[11]) + int(fields[12])
+
+def _fd_budget():
+    """Number of stat files that may be kept open, leaving room under RLIMIT_NOFILE."""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        return min(MAX_CACHED_FDS, soft // 2) if soft != resource.RLIM_INFINITY else MAX_CACHED_FDS
+    except (ImportError, ValueError, OSError):
+        return 0
+
+class ThreadSampler:
+    """Incremental per-thread CPU sampler for a few target processes.
+
+    Each call to sample() reads only /proc/<pid>/task/<tid>/stat for the
+    targets, turns tick deltas into CPU % and decodes each thread's name
+    once, the first time its tid is seen. Stat files stay open between
+    samples (up to a file-descriptor budget) and are re-read with pread,
+    which halves the syscalls per thread; call close() when done.
+    """
+
+    def __init__(self, pids):
+        self.pids = list(pids)
+        self.names = {}  # (pid, tid) -> thread name
+        self.prev_ticks = {}  # (pid, tid) -> cumulative utime + stime
+        self.fds = {}  # (pid, tid) -> open stat file descriptor
+        self.max_fds = _fd_budget()
+        self.prev_time = None
+        self.use_procfs = os.path.isdir(os.path.join(PROC_ROOT, "self", "task"))
+
+    def _read_stat(self, key, path):
+        """Read one thread's stat file, through a cached descriptor when possible."""
+        fd = self.fds.get(key)
+        try:
+            if fd is not None:
+                return os.pread(fd, 1024, 0)
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            self._forget(key)
+            return None
+        try:
+            data = os.pread(fd, 1024, 0)
+        except OSError:
+            os.close(fd)
+            return None
+        if len(self.fds) < self.max_fds:
+            self.fds[key] = fd
+        else:
+            os.close(fd)
+        return data
+
+    def _forget(self, key):
+        """Drop every cache entry of an exited thread."""
+        self.names.pop(key, None)
+        fd = self.fds.pop(key, None)
+        if fd is not None:
+            os.close(fd)
+
+    def close(self):
+        """Close all cached stat descriptors."""
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+
+    def _read_threads(self, pid):
+        """Yield (tid, raw comm, state, ticks) for every live thread of pid."""
+        if self.use_procfs:
+            task_dir = f"{PROC_ROOT}/{pid}/task"
+            try:
+                entries = os.listdir(task_dir)
+            except OSError:
+                return
+            for tid in entries:
+                data = self._read_stat((pid, int(tid)), f"{task_dir}/{tid}/stat")
+                if data:
+                    comm, state, ticks = _parse_stat(data)
+                    yield int(tid), comm, state.decode(), ticks
+            return
+        # Portable fallback: psutil exposes thread CPU times but not names or states
+        try:
+            for thread in psutil.Process(pid).threads():
+                yield thread.id, b"", "?", (thread.user_time + thread.system_time) * CLOCK_TICKS
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+
+    def sample(self):
+        """Return a DataFrame of every thread's CPU % since the previous call."""
+        now = time.monotonic()
+        elapsed = now - self.prev_time if self.prev_time is not None else None
+        self.prev_time = now
+
+        rows, ticks = [], {}
+        for pid in self.pids:
+            for tid, comm, state, total in self._read_threads(pid):
+                key = (pid, tid)
+                name = self.names.get(key)
+                if name is None:
+                    name = self.names[key] = comm.decode(errors="replace") or str(tid)
+                prev = self.prev_ticks.get(key)
+                ticks[key] = total
+                cpu = (total - prev) / CLOCK_TICKS / elapsed * 100 if elapsed and prev is not None else 0.0
+                rows.append((pid, tid, name, THREAD_STATES.get(state, state), round(max(cpu, 0.0), 1)))
+
+        # Forget exited threads so the caches stay proportional to live threads
+        for key in (self.prev_ticks.keys() | self.fds.keys()) - ticks.keys():
+            self._forget(key)
+        self.prev_ticks = ticks
+        return pd.DataFrame(rows, columns=["PID", "TID", "Thread", "State", "CPU (%)"])
+
+    def top(self, n=TOP_THREADS):
+        """Sample and return the n busiest threads."""
+        return self.sample().nlargest(n, "CPU (%)").reset_index(drop=True)
+
+def summarize_threads(threads):
+    """Count threads per state and total CPU for a sample() frame."""
+    states = threads["State"].value_counts().to_dict()
+    return {"Threads": len(threads), "CPU (%)": round(float(threads["CPU (%)"].sum()), 1), **states}
+
+if __name__ == "__main__":
+    import sys
+    sampler = ThreadSampler([int(pid) for pid in sys.argv[1:]] or [os.getpid()])
+    sampler.sample()
+    try:
+        while True:
+            time.sleep(0.25)
+            print(sampler.top().to_string(index=False), "\n")
+    finally:
+        sampler.close()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# History frames are indexed by epoch seconds under this name, sorted ascending.
+TIMESTAMP = "Timestamp"
+SECONDS_PER_UNIT = {"sec": 1, "min": 60, "hou": 3600}
+
+def format_time_values(time_values):
+    """Convert time values to appropriate units."""
+    time_unit = "Seconds"
+    if len(time_values) == 0:
+        return time_values, time_unit
+    if max(time_values) >= 60:
+        time_values = time_values / 60
+        time_unit = "Minutes"
+    if max(time_values) >= 60:
+        time_values = time_values / 60
+        time_unit = "Hours"
+    return time_values, time_unit
+
+def parse_time_labels(labels):
+    """Parse legacy "Time (Unit)" labels such as "42.5 Min" into seconds."""
+    parts = pd.Series(labels).astype(str).str.split(n=1, expand=True)
+    values = parts[0].astype(float).to_numpy()
+    if parts.shape[1] < 2:
+        return values * SECONDS_PER_UNIT["min"]
+    units = parts[1].fillna("min").str[:3].str.lower()
+    return values * units.map(SECONDS_PER_UNIT).fillna(SECONDS_PER_UNIT["min"]).to_numpy()
+
+def make_history(timestamps, data):
+    """Build a history frame indexed and sorted by epoch timestamps."""
+    df = pd.DataFrame(data, index=pd.Index(np.asarray(timestamps, dtype=float), name=TIMESTAMP))
+    return df if df.index.is_monotonic_increasing else df.sort_index(kind="stable")
+
+def from_time_labels(df, anchor):
+    """Convert a legacy frame keyed by "Time (Unit)" labels to a timestamp-indexed history.
+
+    Labels are offsets from the start of the recording; anchor is the epoch
+    time of the last sample.
+    """
+    offsets = parse_time_labels(df["Time (Unit)"])
+    timestamps = anchor - offsets[-1] + offsets if len(offsets) else offsets
+    return make_history(timestamps, df.drop(columns=["Time (Unit)"]).to_dict("list"))
+
+def timestamps_of(history):
+    """Return the history's timestamps as a float numpy array."""
+    return history.index.to_numpy(dtype=float)
+
+def elapsed_seconds(history, origin=None):
+    """Seconds since origin (default: the first sample)."""
+    timestamps = timestamps_of(history)
+    if origin is None:
+        origin = timestamps[0] if len(timestamps) else 0.0
+    return timestamps - origin
+
+def time_range(history, start=None, end=None):
+    """Return samples with start <= timestamp <= end, located by binary search."""
+    timestamps = timestamps_of(history)
+    lo = 0 if start is None else np.searchsorted(timestamps, start, side="left")
+    hi = len(timestamps) if end is None else np.searchsorted(timestamps, end, side="right")
+    return history.iloc[lo:hi]
+
+def last(history, seconds):
+    """Return the trailing window of `seconds` ending at the newest sample."""
+    if history.empty:
+        return history
+    end = timestamps_of(history)[-1]
+    return time_range(history, end - seconds, end)
+
+def resample(history, step, agg="mean", start=None, end=None):
+    """Aggregate samples into fixed buckets of `step` seconds.
+
+    agg is any pandas aggregation name or a dict per column. Buckets are
+    aligned to multiples of step and labelled by their start timestamp;
+    empty buckets are omitted.
+    """
+    window = time_range(history, start, end)
+    if window.empty:
+        return window
+    buckets = np.floor(timestamps_of(window) / step) * step
+    numeric = window.select_dtypes(include="number")
+    resampled = numeric.groupby(buckets).agg(agg)
+    resampled.index.name = TIMESTAMP
+    return resampled
+
+def with_time_labels(history, origin=None):
+    """Return a display copy with a "Time (Unit)" column and a 1-based Index.
+
+    Labels are offsets from origin (default: the first sample) in the unit
+    picked by format_time_values.
+    """
+    values, time_unit = format_time_values(elapsed_seconds(history, origin))
+    display = history.reset_index(drop=True)
+    display.insert(0, "Time (Unit)", [f"{round(v, 2)} {time_unit[:3]}" for v in values])
+    display.index = pd.RangeIndex(1, len(display) + 1, name="Index")
+    return display